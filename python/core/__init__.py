@@ -2,12 +2,14 @@
 Core modules for DataArchive
 
 Contains:
+- compat.py: Python version compatibility helpers
 - database.py: SQLite database interface
 - drive_manager.py: Drive detection and hardware identification
 - drive_validator.py: Path validation
 - file_scanner.py: Recursive file cataloging
 - logger.py: Logging configuration
 - os_detector.py: Operating system detection
+- wsl.py: WSL detection
 """
 
 from .logger import get_logger, Logger
@@ -16,6 +18,7 @@ from .drive_manager import DriveManager
 from .drive_validator import DriveValidator
 from .os_detector import OSDetector
 from .file_scanner import FileScanner
+from .wsl import is_wsl
 
 __all__ = [
     'get_logger',
@@ -24,5 +27,6 @@ __all__ = [
     'DriveManager',
     'DriveValidator',
     'OSDetector',
-    'FileScanner'
+    'FileScanner',
+    'is_wsl'
 ]
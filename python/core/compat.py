@@ -0,0 +1,9 @@
+"""
+Python version compatibility helpers
+"""
+
+import sys
+
+# Keyword arguments for @dataclass that add __slots__ where supported
+# (Python 3.10+); older interpreters get a regular dataclass.
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
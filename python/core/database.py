@@ -3,6 +3,7 @@ Database interface for Data Archive System
 """
 
 import sqlite3
+import sys
 import time
 from pathlib import Path
 from datetime import datetime
@@ -16,6 +17,14 @@ _run_migrations = None
 
 logger = get_logger(__name__)
 
+# Column order matches Database.file_row()
+_INSERT_FILE_SQL = """
+    INSERT INTO files (
+        scan_id, path, size_bytes, modified_date, created_date,
+        accessed_date, extension, is_hidden, is_system, priority
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 class Database:
     """SQLite database interface"""
@@ -407,29 +416,62 @@ class Database:
             ))
             logger.debug(f"Inserted OS info for scan: {scan_id}")
     
+    @staticmethod
+    def file_row(scan_id: int, f: Dict[str, Any]) -> tuple:
+        """Lay out a scanned file's info as a row for insert_file_rows"""
+        return (
+            scan_id,
+            f['path'],
+            f['size_bytes'],
+            f['modified_date'],
+            f['created_date'],
+            f.get('accessed_date'),
+            f['extension'],
+            f.get('is_hidden', False),
+            f.get('is_system', False),
+            f.get('priority', 'medium')
+        )
+
     def insert_files_batch(self, scan_id: int, files: List[Dict[str, Any]]):
         """Batch insert files with retry on lock"""
+        self.insert_file_rows(scan_id, [self.file_row(scan_id, f) for f in files])
+
+    def insert_file_rows(self, scan_id: int, rows: List[tuple]):
+        """Batch insert rows built with file_row(scan_id, ...), with retry on lock"""
         with self.get_connection("insert_files_batch") as conn:
-            conn.executemany("""
-                INSERT INTO files (
-                    scan_id, path, size_bytes, modified_date, created_date,
-                    accessed_date, extension, is_hidden, is_system, priority
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, [
-                (
-                    scan_id,
-                    f['path'],
-                    f['size_bytes'],
-                    f['modified_date'],
-                    f['created_date'],
-                    f.get('accessed_date'),
-                    f['extension'],
-                    f.get('is_hidden', False),
-                    f.get('is_system', False),
-                    f.get('priority', 'medium')
-                ) for f in files
-            ])
-            logger.debug(f"Inserted {len(files)} files for scan: {scan_id}")
+            conn.executemany(_INSERT_FILE_SQL, rows)
+            logger.debug(f"Inserted {len(rows)} files for scan: {scan_id}")
+
+    @contextmanager
+    def bulk_file_inserts(self, scan_id: int):
+        """
+        Keep one tuned connection open for a long run of file inserts.
+
+        Switches the database to WAL with synchronous=NORMAL, so committing
+        a batch no longer waits on an fsync, and reuses the connection and
+        its page cache across batches. Yields a function that inserts a
+        list of file_row(scan_id, ...) tuples and commits them.
+
+        journal_mode=WAL is persistent: it stays set on the database file
+        after this connection closes, for every later connection, including
+        the TypeScript API's, which opens the same archive.db. WAL also adds
+        -wal and -shm files next to the database.
+        """
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-200000")
+
+            def insert_rows(rows: List[tuple]) -> None:
+                with conn:
+                    conn.executemany(_INSERT_FILE_SQL, rows)
+                logger.debug(f"Inserted {len(rows)} files for scan: {scan_id}")
+
+            yield insert_rows
+        finally:
+            conn.close()
     
     def get_scan_info(self, scan_id: int) -> Optional[Dict]:
         """Get scan information"""
@@ -452,7 +494,9 @@ class Database:
                 WHERE scan_id = ?
             """, (scan_id,))
             
-            # Build tree structure
+            # Build tree structure. Directory names repeat across many rows
+            # (e.g. 'Users'), so intern them to share one string per name.
+            intern = sys.intern
             tree = {}
             for row in cursor:
                 path_parts = row['path'].split('/')
@@ -461,6 +505,7 @@ class Database:
                     
                 current = tree
                 for part in path_parts[:-1]:
+                    part = intern(part)
                     if part not in current:
                         current[part] = {
                             'type': 'dir',
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Optional, Dict, Any, List
 
 from .logger import get_logger
+from .wsl import is_wsl
 
 logger = get_logger(__name__)
 
@@ -20,15 +21,7 @@ class DriveValidator:
     
     def __init__(self, mount_path: str):
         self.mount_path = Path(mount_path)
-        self.is_wsl = self._detect_wsl()
-    
-    def _detect_wsl(self) -> bool:
-        """Detect if running in WSL"""
-        try:
-            with open('/proc/version', 'r') as f:
-                return 'microsoft' in f.read().lower() or 'wsl' in f.read().lower()
-        except Exception:
-            return False
+        self.is_wsl = is_wsl()
     
     def validate(self) -> Dict[str, Any]:
         """
@@ -68,15 +68,16 @@ class OSDetector:
     - macOS: System/Library structure detection
     """
 
-    def __init__(self, drive_path: str):
+    def __init__(self, drive_path: str, registry_reader=None):
         """
         Initialize OS detector for a specific drive.
 
         Args:
             drive_path: Path to the mounted drive
+            registry_reader: Optional RegistryReader to reuse (created on demand otherwise)
         """
         self.drive_path = Path(drive_path)
-        self._registry_reader = None
+        self._registry_reader = registry_reader
         logger.debug(f"OSDetector initialized for: {drive_path}")
 
     def _get_registry_reader(self):
@@ -431,4 +432,5 @@ if __name__ == '__main__':
 
     drive_path = sys.argv[1]
     result = detect_os(drive_path)
-    print(json.dumps(result, indent=2, default=str))
+    json.dump(result, sys.stdout, indent=2, default=str)
+    sys.stdout.write('\n')
@@ -0,0 +1,20 @@
+"""
+WSL detection shared by the modules that shell out to Windows tools
+"""
+
+import functools
+import platform
+
+
+@functools.lru_cache(maxsize=1)
+def is_wsl() -> bool:
+    """Detect if running in WSL (cached for the life of the process)"""
+    if platform.system() != 'Linux':
+        return False
+    try:
+        with open('/proc/version', 'r') as f:
+            # The kernel release naming Microsoft/WSL comes within the first line
+            version_info = f.read(512).lower()
+            return 'microsoft' in version_info or 'wsl' in version_info
+    except OSError:
+        return False
@@ -8,6 +8,10 @@ Usage:
   python deduplicate.py --plan             # Generate deletion plan CSV
   python deduplicate.py --execute          # Actually delete files (requires confirmation)
   python deduplicate.py --exclude Backups  # Exclude paths containing "Backups"
+
+Quick hashes are grouped by exact value, so scans still holding legacy
+(unprefixed MD5) quick hashes only match each other; re-run populate_db.py
+on those scans first to find duplicates across old and new scans.
 """
 
 import sys
@@ -1,5 +1,10 @@
 #!/usr/bin/env python
-"""Export duplicate files to CSV with full metadata."""
+"""
+Export duplicate files to CSV with full metadata.
+
+Legacy (unprefixed MD5) quick hashes never equal current v3: values, so
+re-run populate_db.py on older scans before exporting across scans.
+"""
 import sys
 sys.path.insert(0, 'python')
 
@@ -8,8 +8,9 @@ import sqlite3
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Iterable, Tuple
 import logging
+from collections import Counter
 
 # Setup logging
 logging.basicConfig(level=logging.INFO,
@@ -45,7 +46,9 @@ class WindowsIndexExtractor:
             if not self.connect_to_index():
                 return []
 
-        # SQL query to get file metadata from Windows Search Index
+        # SQL query to get file metadata from Windows Search Index.
+        # SCOPE bounds the search to the drive's file: URL subtree, which
+        # the indexer serves directly instead of scanning with LIKE.
         query = f"""
         SELECT TOP {max_results}
             System.ItemPathDisplay,
@@ -70,7 +73,7 @@ class WindowsIndexExtractor:
             System.ProductName,
             System.ProductVersion
         FROM SystemIndex 
-        WHERE System.ItemPathDisplay LIKE '{self.drive_letter}:%'
+        WHERE SCOPE='file:{self.drive_letter}:/'
         ORDER BY System.ItemPathDisplay
         """
 
@@ -118,9 +121,12 @@ class WindowsIndexExtractor:
 
         return files
 
-    def get_directory_structure(self, max_results: int = 10000) -> Dict[str, Any]:
+    def iter_directory_structure(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
         """
-        Get directory structure with file counts and sizes
+        Yield (folder_path, info) for each directory with file counts and sizes.
+
+        Records are yielded as the recordset is read so callers can write
+        them out without holding the whole structure in memory.
         """
         query = f"""
         SELECT 
@@ -128,41 +134,48 @@ class WindowsIndexExtractor:
             COUNT(*) as FileCount,
             SUM(CAST(System.Size as BIGINT)) as TotalSize
         FROM SystemIndex 
-        WHERE System.ItemPathDisplay LIKE '{self.drive_letter}:%'
+        WHERE SCOPE='file:{self.drive_letter}:/'
         AND System.ItemType <> 'Directory'
         GROUP BY System.ItemFolderPathDisplay
         ORDER BY System.ItemFolderPathDisplay
         """
 
-        directories = {}
+        count = 0
         try:
             if not self.connection:
                 if not self.connect_to_index():
-                    return directories
+                    return
 
             recordset = win32com.client.Dispatch("ADODB.Recordset")
             recordset.Open(query, self.connection)
 
-            while not recordset.EOF:
-                folder_path = recordset.Fields("FolderPath").Value or ""
-                file_count = recordset.Fields("FileCount").Value or 0
-                total_size = recordset.Fields("TotalSize").Value or 0
-
-                directories[folder_path] = {
-                    'file_count': file_count,
-                    'total_size': total_size,
-                    'size_mb': round(total_size / (1024 * 1024), 2) if total_size else 0
-                }
+            try:
+                while not recordset.EOF:
+                    folder_path = recordset.Fields("FolderPath").Value or ""
+                    file_count = recordset.Fields("FileCount").Value or 0
+                    total_size = recordset.Fields("TotalSize").Value or 0
+
+                    yield folder_path, {
+                        'file_count': file_count,
+                        'total_size': total_size,
+                        'size_mb': round(total_size / (1024 * 1024), 2) if total_size else 0
+                    }
+                    count += 1
 
-                recordset.MoveNext()
+                    recordset.MoveNext()
+            finally:
+                recordset.Close()
 
-            recordset.Close()
-            logger.info(f"Retrieved {len(directories)} directories")
+            logger.info(f"Retrieved {count} directories")
 
         except Exception as e:
             logger.error(f"Error getting directory structure: {e}")
 
-        return directories
+    def get_directory_structure(self, max_results: int = 10000) -> Dict[str, Any]:
+        """
+        Get directory structure with file counts and sizes
+        """
+        return dict(self.iter_directory_structure())
 
     def save_to_json(self, data: List[Dict], filename: str):
         """Save data to JSON file"""
@@ -174,6 +187,25 @@ class WindowsIndexExtractor:
 
         logger.info(f"Data saved to {output_path}")
 
+    def save_to_ndjson(self, records: Iterable[Tuple[str, Dict[str, Any]]], filename: str) -> int:
+        """
+        Stream (path, info) records to a newline-delimited JSON file.
+
+        Returns the number of records written.
+        """
+        output_path = Path("output") / filename
+        output_path.parent.mkdir(exist_ok=True)
+
+        count = 0
+        with open(output_path, 'w', encoding='utf-8') as f:
+            for path, info in records:
+                f.write(json.dumps({'path': path, **info}, ensure_ascii=False))
+                f.write('\n')
+                count += 1
+
+        logger.info(f"Data saved to {output_path}")
+        return count
+
     def save_to_database(self, files: List[Dict], db_path: str = "output/windows_index.db"):
         """Save file metadata to SQLite database"""
         db_file = Path(db_path)
@@ -250,37 +282,34 @@ class WindowsIndexExtractor:
             return {}
 
         total_files = len(files)
-        total_size = sum(f.get('System.Size', 0) or 0 for f in files)
+        total_size = 0
 
-        # File type distribution
-        file_types = {}
-        extensions = {}
+        # Single pass over the files; Counter.most_common(n) selects the
+        # top entries with a heap rather than sorting every key
+        file_types = Counter()
+        extensions = Counter()
+        directories = Counter()
 
         for f in files:
-            file_type = f.get('System.PerceivedType', 'Unknown')
-            extension = f.get('System.FileExtension', '').lower()
+            total_size += f.get('System.Size', 0) or 0
 
-            file_types[file_type] = file_types.get(file_type, 0) + 1
+            file_types[f.get('System.PerceivedType', 'Unknown')] += 1
+
+            extension = f.get('System.FileExtension', '').lower()
             if extension:
-                extensions[extension] = extensions.get(extension, 0) + 1
+                extensions[extension] += 1
 
-        # Top directories by file count
-        directories = {}
-        for f in files:
             folder = f.get('System.ItemFolderPathDisplay', '')
             if folder:
-                directories[folder] = directories.get(folder, 0) + 1
-
-        top_directories = sorted(
-            directories.items(), key=lambda x: x[1], reverse=True)[:20]
+                directories[folder] += 1
 
         return {
             'total_files': total_files,
             'total_size_bytes': total_size,
             'total_size_gb': round(total_size / (1024**3), 2),
-            'file_types': dict(sorted(file_types.items(), key=lambda x: x[1], reverse=True)),
-            'top_extensions': dict(sorted(extensions.items(), key=lambda x: x[1], reverse=True)[:20]),
-            'top_directories': dict(top_directories),
+            'file_types': dict(file_types.most_common()),
+            'top_extensions': dict(extensions.most_common(20)),
+            'top_directories': dict(directories.most_common(20)),
             'extraction_timestamp': datetime.now().isoformat()
         }
 
@@ -311,9 +340,11 @@ def main():
 
         print(f"Found {len(files)} indexed files")
 
-        # Get directory structure
+        # Stream directory structure straight to disk
         print("\n2. Analyzing directory structure...")
-        directories = extractor.get_directory_structure()
+        directory_count = extractor.save_to_ndjson(
+            extractor.iter_directory_structure(),
+            f"drive_e_directories_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson")
 
         # Generate summary
         print("\n3. Generating summary report...")
@@ -326,10 +357,6 @@ def main():
         extractor.save_to_json(
             files, f"drive_e_files_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
 
-        # Save directory structure
-        extractor.save_to_json(
-            directories, f"drive_e_directories_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-
         # Save summary
         extractor.save_to_json(
             summary, f"drive_e_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
@@ -343,7 +370,7 @@ def main():
         print("="*60)
         print(f"Total Files: {summary.get('total_files', 0):,}")
         print(f"Total Size: {summary.get('total_size_gb', 0)} GB")
-        print(f"Unique Directories: {len(directories)}")
+        print(f"Unique Directories: {directory_count}")
 
         print("\nTop File Types:")
         for file_type, count in list(summary.get('file_types', {}).items())[:10]:
@@ -20,6 +20,7 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.logger import get_logger
+from core.wsl import is_wsl
 from core.database import Database
 from utils.chkdsk_wrapper import ChkdskWrapper, ChkdskResult
 
@@ -105,30 +106,20 @@ class DriveHealthInspector:
     Generates a JSON report suitable for Claude analysis.
     """
 
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, db: Optional[Database] = None):
         """
         Initialize the health inspector.
 
         Args:
             db_path: Path to SQLite database for storing results
+            db: Already-open Database to use instead of db_path
         """
-        self.is_wsl = self._detect_wsl()
+        self.is_wsl = is_wsl()
         self.is_windows = platform.system() == 'Windows'
         self.chkdsk_wrapper = ChkdskWrapper()
-        self.db = Database(db_path) if db_path else None
+        self.db = db if db is not None else (Database(db_path) if db_path else None)
         logger.info(f"DriveHealthInspector initialized (WSL: {self.is_wsl}, Windows: {self.is_windows})")
 
-    def _detect_wsl(self) -> bool:
-        """Detect if running in WSL"""
-        try:
-            if platform.system() == 'Linux':
-                with open('/proc/version', 'r') as f:
-                    version_info = f.read().lower()
-                    return 'microsoft' in version_info or 'wsl' in version_info
-        except Exception:
-            pass
-        return False
-
     def _find_powershell(self) -> Optional[str]:
         """Find PowerShell executable"""
         if self.is_windows:
@@ -477,7 +468,8 @@ $result | ConvertTo-Json -Depth 3
 def run_health_inspection(drive_path: str, db_path: Optional[str] = None,
                           session_id: Optional[int] = None,
                           skip_smart: bool = False,
-                          json_output: bool = False) -> Dict[str, Any]:
+                          json_output: bool = False,
+                          db: Optional[Database] = None) -> Dict[str, Any]:
     """
     Convenience function to run health inspection.
 
@@ -487,11 +479,12 @@ def run_health_inspection(drive_path: str, db_path: Optional[str] = None,
         session_id: Optional inspection session ID
         skip_smart: Skip SMART data retrieval
         json_output: Return raw dict for JSON serialization
+        db: Already-open Database to use instead of db_path
 
     Returns:
         Health report as dictionary
     """
-    inspector = DriveHealthInspector(db_path)
+    inspector = DriveHealthInspector(db_path, db=db)
     report = inspector.inspect(drive_path, session_id, skip_smart)
 
     if json_output:
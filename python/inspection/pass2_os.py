@@ -21,6 +21,7 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.logger import get_logger
+from core.wsl import is_wsl
 from core.database import Database
 from core.os_detector import OSDetector, OSDetectionResult
 
@@ -105,29 +106,19 @@ class EnhancedOSDetector:
     Generates a JSON report suitable for Claude analysis.
     """
 
-    def __init__(self, db_path: Optional[str] = None):
+    def __init__(self, db_path: Optional[str] = None, db: Optional[Database] = None):
         """
         Initialize the enhanced OS detector.
 
         Args:
             db_path: Path to SQLite database for storing results
+            db: Already-open Database to use instead of db_path
         """
-        self.is_wsl = self._detect_wsl()
+        self.is_wsl = is_wsl()
         self.is_windows = platform.system() == 'Windows'
-        self.db = Database(db_path) if db_path else None
+        self.db = db if db is not None else (Database(db_path) if db_path else None)
         logger.info(f"EnhancedOSDetector initialized (WSL: {self.is_wsl}, Windows: {self.is_windows})")
 
-    def _detect_wsl(self) -> bool:
-        """Detect if running in WSL"""
-        try:
-            if platform.system() == 'Linux':
-                with open('/proc/version', 'r') as f:
-                    version_info = f.read().lower()
-                    return 'microsoft' in version_info or 'wsl' in version_info
-        except Exception:
-            pass
-        return False
-
     def _extract_drive_letter(self, drive_path: str) -> Optional[str]:
         """Extract Windows drive letter from path"""
         import re
@@ -139,7 +130,8 @@ class EnhancedOSDetector:
         return None
 
     def inspect(self, drive_path: str, session_id: Optional[int] = None,
-                include_extra_analysis: bool = True) -> OSReport:
+                include_extra_analysis: bool = True,
+                registry_reader=None) -> OSReport:
         """
         Perform complete OS detection inspection on a drive.
 
@@ -147,6 +139,7 @@ class EnhancedOSDetector:
             drive_path: Path to the drive (e.g., '/mnt/d', 'D:')
             session_id: Optional inspection session ID for database recording
             include_extra_analysis: Include user profiles, features, etc.
+            registry_reader: Optional RegistryReader to reuse across passes
 
         Returns:
             OSReport with complete detection results
@@ -165,7 +158,7 @@ class EnhancedOSDetector:
         # Step 1: Run primary OS detection
         logger.info("Running enhanced OS detection...")
         try:
-            detector = OSDetector(drive_path)
+            detector = OSDetector(drive_path, registry_reader)
             detection_result = detector.detect()
 
             # Transfer detection results to report
@@ -386,7 +379,9 @@ class EnhancedOSDetector:
 def run_os_inspection(drive_path: str, db_path: Optional[str] = None,
                       session_id: Optional[int] = None,
                       include_extra: bool = True,
-                      json_output: bool = False) -> Dict[str, Any]:
+                      json_output: bool = False,
+                      db: Optional[Database] = None,
+                      registry_reader=None) -> Dict[str, Any]:
     """
     Convenience function to run OS detection inspection.
 
@@ -396,12 +391,14 @@ def run_os_inspection(drive_path: str, db_path: Optional[str] = None,
         session_id: Optional inspection session ID
         include_extra: Include extra analysis (users, features)
         json_output: Return raw dict for JSON serialization
+        db: Already-open Database to use instead of db_path
+        registry_reader: Optional RegistryReader to reuse across passes
 
     Returns:
         OS report as dictionary
     """
-    inspector = EnhancedOSDetector(db_path)
-    report = inspector.inspect(drive_path, session_id, include_extra)
+    inspector = EnhancedOSDetector(db_path, db=db)
+    report = inspector.inspect(drive_path, session_id, include_extra, registry_reader)
 
     return report.to_dict()
 
@@ -24,7 +24,7 @@ from core.logger import get_logger
 from core.database import Database
 from core.file_scanner import FileScanner
 from utils.hash_utils import (
-    compute_quick_hash,
+    iter_quick_hashes,
     compute_sha256,
     generate_composite_key,
     HashResult,
@@ -184,7 +184,8 @@ class MetadataCapture:
     def __init__(self, db_path: Optional[str] = None,
                  min_duplicate_size: int = DEFAULT_MIN_SIZE_FOR_DUPLICATE,
                  batch_size: int = DEFAULT_BATCH_SIZE,
-                 enable_inline_hashing: bool = True):
+                 enable_inline_hashing: bool = True,
+                 db: Optional[Database] = None):
         """
         Initialize the metadata capture inspector.
 
@@ -193,8 +194,9 @@ class MetadataCapture:
             min_duplicate_size: Minimum file size for duplicate detection
             batch_size: Database batch insert size
             enable_inline_hashing: Compute hashes during scan (faster than separate pass)
+            db: Already-open Database to use instead of db_path
         """
-        self.db = Database(db_path) if db_path else None
+        self.db = db if db is not None else (Database(db_path) if db_path else None)
         self.min_duplicate_size = min_duplicate_size
         self.batch_size = batch_size
         self.enable_inline_hashing = enable_inline_hashing
@@ -483,16 +485,12 @@ class MetadataCapture:
         except ImportError:
             iterator = files_to_hash
 
-        for row in iterator:
+        # Quick hashes are computed concurrently, in the same order as rows
+        full_paths = (str(drive_path_obj / row['path']) for row in files_to_hash)
+
+        for row, (quick_hash, error) in zip(iterator, iter_quick_hashes(full_paths)):
             file_id = row['file_id']
             rel_path = row['path']
-            file_size = row['size_bytes']
-
-            # Build full path
-            full_path = str(drive_path_obj / rel_path)
-
-            # Compute quick hash
-            quick_hash, error = compute_quick_hash(full_path)
 
             if quick_hash:
                 hash_batch.append({
@@ -725,7 +723,8 @@ def run_metadata_inspection(drive_path: str, db_path: Optional[str] = None,
                             enable_hashing: bool = True,
                             verify_sha256: bool = False,
                             show_progress: bool = True,
-                            json_output: bool = False) -> Dict[str, Any]:
+                            json_output: bool = False,
+                            db: Optional[Database] = None) -> Dict[str, Any]:
     """
     Convenience function to run metadata capture inspection.
 
@@ -738,11 +737,12 @@ def run_metadata_inspection(drive_path: str, db_path: Optional[str] = None,
         verify_sha256: Verify duplicates with SHA-256
         show_progress: Show progress bar
         json_output: Return raw dict for JSON serialization
+        db: Already-open Database to use instead of db_path
 
     Returns:
         Metadata report as dictionary
     """
-    inspector = MetadataCapture(db_path)
+    inspector = MetadataCapture(db_path, db=db)
     report = inspector.inspect(
         drive_path,
         session_id=session_id,
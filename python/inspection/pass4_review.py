@@ -147,15 +147,17 @@ class InteractiveReview:
     """
 
     def __init__(self, db_path: Optional[str] = None,
-                 reports_dir: str = "data/reports"):
+                 reports_dir: str = "data/reports",
+                 db: Optional[Database] = None):
         """
         Initialize the interactive review inspector.
 
         Args:
             db_path: Path to SQLite database for storing results
             reports_dir: Directory for saving markdown reports
+            db: Already-open Database to use instead of db_path
         """
-        self.db = Database(db_path) if db_path else None
+        self.db = db if db is not None else (Database(db_path) if db_path else None)
         self.reports_dir = Path(reports_dir)
         self.reports_dir.mkdir(parents=True, exist_ok=True)
         logger.info(f"InteractiveReview initialized (reports_dir={reports_dir})")
@@ -633,7 +635,8 @@ def run_review_inspection(drive_path: str, db_path: Optional[str] = None,
                           session_id: Optional[int] = None,
                           auto_resolve: bool = False,
                           generate_report: bool = True,
-                          json_output: bool = False) -> Dict[str, Any]:
+                          json_output: bool = False,
+                          db: Optional[Database] = None) -> Dict[str, Any]:
     """
     Convenience function to run interactive review inspection.
 
@@ -644,11 +647,12 @@ def run_review_inspection(drive_path: str, db_path: Optional[str] = None,
         auto_resolve: Automatically resolve with defaults
         generate_report: Generate markdown report
         json_output: Return raw dict for JSON serialization
+        db: Already-open Database to use instead of db_path
 
     Returns:
         Review report as dictionary
     """
-    inspector = InteractiveReview(db_path)
+    inspector = InteractiveReview(db_path, db=db)
     report = inspector.inspect(
         drive_path,
         session_id=session_id,
@@ -2,6 +2,14 @@
 """
 Compute and store file hashes for a scan.
 Matches the actual database schema.
+
+Quick hashes stored in an older format (unprefixed MD5 values, or any
+prefix other than the current QUICK_HASH_VERSION) never equal current
+values, so those files are re-hashed when a scan is re-processed. An old
+row is only replaced once its new hash has been computed, in the same
+transaction; files that can't be read keep their old value. Until every
+file of a scan has been re-hashed, the scan holds a mix of formats and
+old-format files simply won't group with new-format ones.
 """
 
 import sys
@@ -13,12 +21,34 @@ from datetime import datetime
 # Add python directory to path
 sys.path.insert(0, str(Path(__file__).parent / 'python'))
 
-from utils.hash_utils import compute_quick_hash, compute_sha256
+from utils.hash_utils import compute_quick_hash, compute_sha256, QUICK_HASH_VERSION
 from core.logger import get_logger
 from core.progress_reporter import ProgressReporter
 
 logger = get_logger(__name__)
 
+# A recomputed hash replaces any row of the same type left by an earlier run
+_DELETE_HASH_SQL = '''
+    DELETE FROM file_hashes
+    WHERE scan_id = :scan_id AND file_id = :file_id AND hash_type = :hash_type
+'''
+_INSERT_HASH_SQL = '''
+    INSERT INTO file_hashes (scan_id, file_id, hash_type, hash_value, computed_at)
+    VALUES (:scan_id, :file_id, :hash_type, :hash_value, :computed_at)
+'''
+
+
+def _replace_hashes(conn, cursor, hash_batch):
+    """Swap in a batch of hashes, deleting the rows they supersede in the same transaction"""
+    try:
+        cursor.executemany(_DELETE_HASH_SQL, hash_batch)
+        cursor.executemany(_INSERT_HASH_SQL, hash_batch)
+        conn.commit()
+    except sqlite3.Error:
+        # Keep the old rows rather than committing the deletes alone
+        conn.rollback()
+        raise
+
 
 def compute_hashes(scan_id, db_path='data/archive.db', batch_size=500, verify_sha256=False):
     """Compute hashes for all files in a scan"""
@@ -33,17 +63,19 @@ def compute_hashes(scan_id, db_path='data/archive.db', batch_size=500, verify_sh
         return 0, 0
 
     try:
-        # Get files that don't have hashes yet
+        # Get files without a quick hash in the current format; older-format
+        # values never group with current ones, so those files are re-hashed
         cursor.execute('''
             SELECT f.file_id, f.path, f.size_bytes, s.mount_point
             FROM files f
             JOIN scans s ON f.scan_id = s.scan_id
             WHERE f.scan_id = ?
               AND NOT EXISTS (
-                SELECT 1 FROM file_hashes WHERE file_id = f.file_id AND hash_type = 'quick_hash'
+                SELECT 1 FROM file_hashes
+                WHERE file_id = f.file_id AND hash_type = 'quick_hash' AND hash_value LIKE ?
               )
             ORDER BY f.file_id
-        ''', (scan_id,))
+        ''', (scan_id, f"{QUICK_HASH_VERSION}:%"))
 
         files = cursor.fetchall()
         total = len(files)
@@ -124,11 +156,7 @@ def compute_hashes(scan_id, db_path='data/archive.db', batch_size=500, verify_sh
 
             while retry_count < max_retries:
                 try:
-                    cursor.executemany('''
-                        INSERT INTO file_hashes (scan_id, file_id, hash_type, hash_value, computed_at)
-                        VALUES (:scan_id, :file_id, :hash_type, :hash_value, :computed_at)
-                    ''', hash_batch)
-                    conn.commit()
+                    _replace_hashes(conn, cursor, hash_batch)
                     break  # Success
                 except sqlite3.IntegrityError as e:
                     logger.error(f"Duplicate key in hash batch: {e}")
@@ -164,11 +192,7 @@ def compute_hashes(scan_id, db_path='data/archive.db', batch_size=500, verify_sh
     # Insert remaining with retry
     if hash_batch:
         try:
-            cursor.executemany('''
-                INSERT INTO file_hashes (scan_id, file_id, hash_type, hash_value, computed_at)
-                VALUES (:scan_id, :file_id, :hash_type, :hash_value, :computed_at)
-            ''', hash_batch)
-            conn.commit()
+            _replace_hashes(conn, cursor, hash_batch)
         except sqlite3.Error as e:
             logger.error(f"Failed to insert final hash batch: {e}", exc_info=True)
 
@@ -20,7 +20,7 @@ from datetime import datetime
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from utils.hash_utils import compute_sha256
+from utils.hash_utils import iter_sha256_hashes
 from core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -64,14 +64,12 @@ class HashPopulator:
         logger.info(f"Starting SHA-256 computation for {len(files):,} files")
         print(f"\nComputing SHA-256 for {len(files):,} files...")
 
-        for i, file_row in enumerate(files, 1):
+        # Files are hashed several at a time, in the same order as rows
+        file_paths = (os.path.join(row['mount_point'] or '', row['path']) for row in files)
+
+        for i, (file_row, (sha256_hash, error)) in enumerate(zip(files, iter_sha256_hashes(file_paths)), 1):
             file_id = file_row['file_id']
             relative_path = file_row['path']
-            mount_point = file_row['mount_point'] or ''
-
-            file_path = os.path.join(mount_point, relative_path)
-
-            sha256_hash, error = compute_sha256(file_path)
 
             if error:
                 errors += 1
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Run inspection passes for a drive
+
+Runs a single pass (1-4) or all four in one process, sharing one Database
+and one RegistryReader so start-up and registry caches are paid once.
+
+Standalone CLI only: the API (PythonBridge.runInspectionPass) still starts
+each pass as its own inspection/passN_*.py process, one request per pass.
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.logger import get_logger
+from core.database import Database
+from inspection import (
+    run_health_inspection,
+    run_os_inspection,
+    run_metadata_inspection,
+    run_review_inspection,
+)
+
+logger = get_logger(__name__)
+
+PASS_CHOICES = ['1', '2', '3', '4', 'all']
+
+
+def run_passes(drive_path: str, passes, db_path: Optional[str] = None,
+               session_id: Optional[int] = None,
+               skip_smart: bool = False,
+               enable_hashing: bool = True,
+               auto_resolve: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    Run the given inspection passes in order.
+
+    Args:
+        drive_path: Path to drive
+        passes: Pass numbers to run, e.g. [1, 2, 3, 4]
+        db_path: Optional database path
+        session_id: Optional inspection session ID
+        skip_smart: Skip SMART data retrieval (pass 1)
+        enable_hashing: Enable duplicate detection (pass 3)
+        auto_resolve: Automatically resolve decisions with defaults (pass 4)
+
+    Returns:
+        Dictionary mapping pass number (as a string) to its report
+    """
+    db = Database(db_path) if db_path else None
+    reader = None
+    if 2 in passes:
+        try:
+            from utils.registry_reader import RegistryReader
+            reader = RegistryReader(drive_path)
+        except ImportError:
+            logger.warning("Registry reader not available")
+
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        for pass_num in passes:
+            logger.info(f"Running pass {pass_num} for {drive_path}")
+            if pass_num == 1:
+                results['1'] = run_health_inspection(
+                    drive_path, session_id=session_id, skip_smart=skip_smart,
+                    json_output=True, db=db
+                )
+            elif pass_num == 2:
+                results['2'] = run_os_inspection(
+                    drive_path, session_id=session_id,
+                    json_output=True, db=db, registry_reader=reader
+                )
+            elif pass_num == 3:
+                results['3'] = run_metadata_inspection(
+                    drive_path, session_id=session_id, enable_hashing=enable_hashing,
+                    show_progress=False, json_output=True, db=db
+                )
+            elif pass_num == 4:
+                results['4'] = run_review_inspection(
+                    drive_path, session_id=session_id, auto_resolve=auto_resolve,
+                    json_output=True, db=db
+                )
+    finally:
+        if reader is not None:
+            reader.close()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run inspection passes for a drive')
+    parser.add_argument('drive_path', help='Path to drive (e.g., /mnt/d or D:)')
+    parser.add_argument('pass_num', choices=PASS_CHOICES, help="Pass to run (1-4) or 'all'")
+    parser.add_argument('--db', help='Database path for storing results')
+    parser.add_argument('--session', type=int, help='Inspection session ID')
+    parser.add_argument('--skip-smart', action='store_true', help='Skip SMART data retrieval')
+    parser.add_argument('--no-hashing', action='store_true', help='Skip duplicate detection')
+    parser.add_argument('--auto-resolve', action='store_true', help='Auto-resolve with defaults')
+    parser.add_argument('--json', action='store_true', help='Output as JSON')
+    args = parser.parse_args()
+
+    passes = [1, 2, 3, 4] if args.pass_num == 'all' else [int(args.pass_num)]
+
+    results = run_passes(
+        args.drive_path,
+        passes,
+        db_path=args.db,
+        session_id=args.session,
+        skip_smart=args.skip_smart,
+        enable_hashing=not args.no_hashing,
+        auto_resolve=args.auto_resolve
+    )
+
+    if args.json:
+        output = results if args.pass_num == 'all' else results[args.pass_num]
+        # Stream to stdout rather than building the whole string first
+        json.dump(output, sys.stdout, indent=2, default=str)
+        sys.stdout.write('\n')
+    else:
+        for pass_num, report in results.items():
+            print(f"Pass {pass_num}: {report.get('summary', '')}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
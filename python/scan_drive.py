@@ -249,23 +249,27 @@ def main():
 
             file_count = 0
             total_size = 0
+            # Rows are kept as tuples in column order, ready for executemany
             batch = []
-            batch_size = 1000
+            batch_size = 5000
+            file_row = db.file_row
 
-            for file_info in scanner.scan(show_progress=not args.no_progress,
-                                          enable_hashing=args.hash):
-                batch.append(file_info)
-                file_count += 1
-                total_size += file_info['size_bytes']
-                
-                # Batch insert
-                if len(batch) >= batch_size:
-                    db.insert_files_batch(scan_id, batch)
-                    batch = []
-            
-            # Insert remaining
-            if batch:
-                db.insert_files_batch(scan_id, batch)
+            # One WAL connection for the whole scan instead of one per batch
+            with db.bulk_file_inserts(scan_id) as insert_rows:
+                for file_info in scanner.scan(show_progress=not args.no_progress,
+                                              enable_hashing=args.hash):
+                    batch.append(file_row(scan_id, file_info))
+                    file_count += 1
+                    total_size += file_info['size_bytes']
+
+                    # Batch insert
+                    if len(batch) >= batch_size:
+                        insert_rows(batch)
+                        batch = []
+
+                # Insert remaining
+                if batch:
+                    insert_rows(batch)
             
             logger.info(f"✓ File scan complete: {file_count:,} files")
             logger.info(f"  Total size: {total_size / (1024**3):.2f} GB")
@@ -1,7 +1,7 @@
 """Utility modules for DataArchive"""
 
 from .power_manager import PowerManager, prevent_sleep
-from .chkdsk_wrapper import ChkdskWrapper, ChkdskResult, run_chkdsk
+from .chkdsk_wrapper import ChkdskWrapper, ChkdskResult, run_chkdsk, run_chkdsk_many
 from .registry_reader import (
     RegistryReader,
     RegistryValue,
@@ -13,11 +13,16 @@ from .registry_reader import (
 from .hash_utils import (
     HashResult,
     compute_quick_hash,
+    iter_quick_hashes,
     compute_sha256,
+    iter_sha256_hashes,
     hash_file,
+    clear_hash_cache,
     files_are_duplicates,
     generate_composite_key,
-    parse_composite_key
+    parse_composite_key,
+    generate_composite_keys,
+    parse_composite_keys
 )
 
 __all__ = [
@@ -26,6 +31,7 @@ __all__ = [
     'ChkdskWrapper',
     'ChkdskResult',
     'run_chkdsk',
+    'run_chkdsk_many',
     'RegistryReader',
     'RegistryValue',
     'RegistryKey',
@@ -35,9 +41,14 @@ __all__ = [
     # Hash utilities for duplicate detection
     'HashResult',
     'compute_quick_hash',
+    'iter_quick_hashes',
     'compute_sha256',
+    'iter_sha256_hashes',
     'hash_file',
+    'clear_hash_cache',
     'files_are_duplicates',
     'generate_composite_key',
-    'parse_composite_key'
+    'parse_composite_key',
+    'generate_composite_keys',
+    'parse_composite_keys'
 ]
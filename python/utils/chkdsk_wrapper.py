@@ -7,22 +7,110 @@ native Windows and WSL environments.
 
 import os
 import re
+import asyncio
+import functools
 import platform
 import subprocess
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Tuple
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.logger import get_logger
+from core.compat import DATACLASS_SLOTS
+from core.wsl import is_wsl
+from utils.powershell_host import PowerShellHost
 
 logger = get_logger(__name__)
 
+# Patterns for chkdsk's report lines, compiled once at import
+_VOLUME_LABEL_RE = re.compile(r'volume label is (.+)', re.IGNORECASE)
+_FILESYSTEM_RE = re.compile(r'file system is (\w+)', re.IGNORECASE)
+_STAGE_RE = re.compile(r'stage (\d+) of (\d+)', re.IGNORECASE)
+_BAD_SECTORS_RE = re.compile(r'(\d+)\s+(?:KB|bytes)\s+in bad sectors', re.IGNORECASE)
+_ALLOC_UNIT_RE = re.compile(r'([\d,]+)\s+bytes\s+(?:in each )?allocation unit', re.IGNORECASE)
 
-@dataclass
+# Size lines in chkdsk's summary, e.g. "976,760,831 KB total disk space."
+_TOTAL_RE = re.compile(r'([\d,]+)\s+(KB|bytes|MB|GB)\s+total disk space', re.IGNORECASE)
+_FREE_RE = re.compile(r'([\d,]+)\s+(KB|bytes|MB|GB)\s+(?:are )?available', re.IGNORECASE)
+
+_UNIT_MULT = {
+    'bytes': 1,
+    'kb': 1024,
+    'mb': 1024 * 1024,
+    'gb': 1024 * 1024 * 1024,
+}
+
+
+# Lines containing these suggest a problem, unless an exclude also matches
+_ERROR_KEYWORDS = (
+    'error', 'corrupt', 'damaged', 'failed', 'unreadable',
+    'lost chain', 'cross-linked', 'invalid'
+)
+_ERROR_EXCLUDES = ('error-free', 'no errors found', 'windows has scanned')
+
+# Non-empty lines of chkdsk output, matched in place without splitting
+_LINE_RE = re.compile(r'[^\r\n]+')
+
+
+def _to_bytes(match: re.Match) -> int:
+    """Convert a (value, unit) size match to bytes"""
+    return int(match.group(1).replace(',', '')) * _UNIT_MULT[match.group(2).lower()]
+
+
+def _set_volume_label(match: re.Match, result: 'ChkdskResult') -> None:
+    result.volume_label = match.group(1).strip()
+
+
+def _set_filesystem(match: re.Match, result: 'ChkdskResult') -> None:
+    result.filesystem_type = match.group(1).upper()
+
+
+def _add_stage(match: re.Match, result: 'ChkdskResult') -> None:
+    result.stage_results.append({
+        'stage_number': int(match.group(1)),
+        'total_stages': int(match.group(2)),
+        'description': match.string,
+        'status': 'running'
+    })
+
+
+def _set_bad_sectors(match: re.Match, result: 'ChkdskResult') -> None:
+    result.bad_sectors = int(match.group(1))
+    if result.bad_sectors > 0:
+        result.errors_found = True
+        result.warnings.append(f"Bad sectors detected: {result.bad_sectors}")
+
+
+def _set_total_bytes(match: re.Match, result: 'ChkdskResult') -> None:
+    result.total_bytes = _to_bytes(match)
+
+
+def _set_free_bytes(match: re.Match, result: 'ChkdskResult') -> None:
+    result.free_bytes = _to_bytes(match)
+
+
+def _set_allocation_unit(match: re.Match, result: 'ChkdskResult') -> None:
+    result.allocation_unit_bytes = int(match.group(1).replace(',', ''))
+
+
+# (literal, pattern, handler): the pattern is only tried when the lowercased
+# literal appears in the line, which rules out most chkdsk output cheaply
+_LINE_HANDLERS = (
+    ('volume label is', _VOLUME_LABEL_RE, _set_volume_label),
+    ('file system is', _FILESYSTEM_RE, _set_filesystem),
+    ('stage ', _STAGE_RE, _add_stage),
+    ('in bad sectors', _BAD_SECTORS_RE, _set_bad_sectors),
+    ('total disk space', _TOTAL_RE, _set_total_bytes),
+    ('available', _FREE_RE, _set_free_bytes),
+    ('allocation unit', _ALLOC_UNIT_RE, _set_allocation_unit),
+)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class ChkdskResult:
     """Results from a chkdsk scan"""
     success: bool = False
@@ -51,25 +139,32 @@ class ChkdskResult:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
-        return {
-            'success': self.success,
-            'drive_letter': self.drive_letter,
-            'volume_label': self.volume_label,
-            'filesystem_type': self.filesystem_type,
-            'total_bytes': self.total_bytes,
-            'used_bytes': self.used_bytes,
-            'free_bytes': self.free_bytes,
-            'allocation_unit_bytes': self.allocation_unit_bytes,
-            'total_allocation_units': self.total_allocation_units,
-            'errors_found': self.errors_found,
-            'bad_sectors': self.bad_sectors,
-            'stage_results': self.stage_results,
-            'warnings': self.warnings,
-            'errors': self.errors,
-            'raw_output': self.raw_output,
-            'exit_code': self.exit_code,
-            'execution_time_seconds': self.execution_time_seconds
-        }
+        return asdict(self)
+
+
+@functools.lru_cache(maxsize=1)
+def _find_powershell() -> Optional[str]:
+    """Find the PowerShell executable path (cached for the life of the process)"""
+    if platform.system() == 'Windows':
+        return 'powershell.exe'
+    elif is_wsl():
+        # Common WSL locations for PowerShell
+        paths = [
+            '/mnt/c/Windows/System32/WindowsPowerShell/v1.0/powershell.exe',
+            '/mnt/c/Program Files/PowerShell/7/pwsh.exe',
+        ]
+        for path in paths:
+            if os.path.exists(path):
+                return path
+        # Try using the PATH
+        try:
+            result = subprocess.run(['which', 'powershell.exe'],
+                                   capture_output=True, text=True)
+            if result.returncode == 0:
+                return result.stdout.strip()
+        except Exception:
+            pass
+    return None
 
 
 class ChkdskWrapper:
@@ -84,43 +179,16 @@ class ChkdskWrapper:
     """
 
     def __init__(self):
-        self.is_wsl = self._detect_wsl()
+        self.is_wsl = is_wsl()
         self.is_windows = platform.system() == 'Windows'
-        self.powershell_path = self._find_powershell()
+        self.powershell_path = _find_powershell()
+        self._ps_host: Optional[PowerShellHost] = None
 
-    def _detect_wsl(self) -> bool:
-        """Detect if running in WSL"""
-        try:
-            if platform.system() == 'Linux':
-                with open('/proc/version', 'r') as f:
-                    version_info = f.read().lower()
-                    return 'microsoft' in version_info or 'wsl' in version_info
-        except Exception:
-            pass
-        return False
-
-    def _find_powershell(self) -> Optional[str]:
-        """Find the PowerShell executable path"""
-        if self.is_windows:
-            return 'powershell.exe'
-        elif self.is_wsl:
-            # Common WSL locations for PowerShell
-            paths = [
-                '/mnt/c/Windows/System32/WindowsPowerShell/v1.0/powershell.exe',
-                '/mnt/c/Program Files/PowerShell/7/pwsh.exe',
-            ]
-            for path in paths:
-                if os.path.exists(path):
-                    return path
-            # Try using the PATH
-            try:
-                result = subprocess.run(['which', 'powershell.exe'],
-                                       capture_output=True, text=True)
-                if result.returncode == 0:
-                    return result.stdout.strip()
-            except Exception:
-                pass
-        return None
+    def close(self) -> None:
+        """Shut down the shared PowerShell host, if one was started"""
+        if self._ps_host:
+            self._ps_host.close()
+            self._ps_host = None
 
     def can_run_chkdsk(self) -> bool:
         """Check if chkdsk can be executed"""
@@ -145,6 +213,29 @@ class ChkdskWrapper:
 
         return None
 
+    def _prepare_run(self, drive_path: str) -> Tuple[ChkdskResult, Optional[str]]:
+        """
+        Resolve the drive letter and check chkdsk is available.
+
+        Returns:
+            (result, drive_letter); drive_letter is None when chkdsk can't
+            run, in which case result already carries the error
+        """
+        result = ChkdskResult()
+
+        drive_letter = self._extract_drive_letter(drive_path)
+        if not drive_letter:
+            result.errors.append(f"Could not extract drive letter from path: {drive_path}")
+            return result, None
+
+        result.drive_letter = drive_letter
+
+        if not self.can_run_chkdsk():
+            result.errors.append("ChkDsk is not available in this environment")
+            return result, None
+
+        return result, drive_letter
+
     def run_chkdsk(self, drive_path: str, timeout_seconds: int = 300) -> ChkdskResult:
         """
         Run chkdsk /scan on the specified drive.
@@ -159,17 +250,8 @@ class ChkdskWrapper:
         Returns:
             ChkdskResult with parsed output and health indicators
         """
-        result = ChkdskResult()
-
-        drive_letter = self._extract_drive_letter(drive_path)
+        result, drive_letter = self._prepare_run(drive_path)
         if not drive_letter:
-            result.errors.append(f"Could not extract drive letter from path: {drive_path}")
-            return result
-
-        result.drive_letter = drive_letter
-
-        if not self.can_run_chkdsk():
-            result.errors.append("ChkDsk is not available in this environment")
             return result
 
         logger.info(f"Running chkdsk /scan on drive {drive_letter}:")
@@ -182,17 +264,66 @@ class ChkdskWrapper:
             else:
                 output, exit_code = self._run_chkdsk_windows(drive_letter, timeout_seconds)
 
-            result.raw_output = output
-            result.exit_code = exit_code
-            result.execution_time_seconds = (datetime.now() - start_time).total_seconds()
+            self._apply_output(result, output, exit_code, start_time)
+
+        except subprocess.TimeoutExpired:
+            result.errors.append(f"ChkDsk timed out after {timeout_seconds} seconds")
+            result.execution_time_seconds = timeout_seconds
+            logger.error(f"ChkDsk timed out on drive {drive_letter}:")
+
+        except Exception as e:
+            result.errors.append(f"ChkDsk execution failed: {str(e)}")
+            logger.error(f"ChkDsk failed: {e}")
+
+        return result
 
-            # Parse the output
-            self._parse_chkdsk_output(output, result)
+    async def run_chkdsk_async(self, drive_path: str, timeout_seconds: int = 300) -> ChkdskResult:
+        """
+        Run chkdsk /scan on the specified drive without blocking the event loop.
 
-            # Success if we got output and no critical errors
-            result.success = bool(output) and exit_code in [0, 1]  # 1 = errors found but completed
+        chkdsk is I/O-bound on its own volume, so several drives can be
+        scanned concurrently (see run_chkdsk_many).
 
-        except subprocess.TimeoutExpired:
+        Args:
+            drive_path: Path to drive (e.g., 'D:', '/mnt/d', 'D:\\')
+            timeout_seconds: Maximum time to wait for chkdsk (default 5 minutes)
+
+        Returns:
+            ChkdskResult with parsed output and health indicators
+        """
+        result, drive_letter = self._prepare_run(drive_path)
+        if not drive_letter:
+            return result
+
+        logger.info(f"Running chkdsk /scan on drive {drive_letter}: (async)")
+
+        start_time = datetime.now()
+
+        if self.is_wsl:
+            command = [self.powershell_path, '-Command', self._build_ps_command(drive_letter)]
+        else:
+            command = ['chkdsk', f'{drive_letter}:', '/scan']
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout_seconds)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                raise
+
+            output = stdout.decode(errors='replace')
+            if stderr:
+                output += "\n--- STDERR ---\n" + stderr.decode(errors='replace')
+
+            self._apply_output(result, output, process.returncode, start_time)
+
+        except asyncio.TimeoutError:
             result.errors.append(f"ChkDsk timed out after {timeout_seconds} seconds")
             result.execution_time_seconds = timeout_seconds
             logger.error(f"ChkDsk timed out on drive {drive_letter}:")
@@ -203,30 +334,59 @@ class ChkdskWrapper:
 
         return result
 
-    def _run_chkdsk_wsl(self, drive_letter: str, timeout_seconds: int) -> tuple:
-        """Run chkdsk from WSL using PowerShell"""
+    async def run_chkdsk_many(self, drive_paths: List[str],
+                              timeout_seconds: int = 300) -> List[ChkdskResult]:
+        """
+        Run chkdsk /scan on several drives concurrently.
+
+        Total wall time is bounded by the slowest drive rather than the sum
+        of all drives.
+
+        Args:
+            drive_paths: Paths to drives (e.g., ['/mnt/d', '/mnt/e'])
+            timeout_seconds: Maximum time to wait for each chkdsk
+
+        Returns:
+            List of ChkdskResult in the same order as drive_paths
+        """
+        return await asyncio.gather(
+            *(self.run_chkdsk_async(d, timeout_seconds) for d in drive_paths)
+        )
+
+    def _apply_output(self, result: ChkdskResult, output: str, exit_code: int,
+                      start_time: datetime) -> None:
+        """Record raw chkdsk output on result and parse it"""
+        result.raw_output = output
+        result.exit_code = exit_code
+        result.execution_time_seconds = (datetime.now() - start_time).total_seconds()
+
+        # Parse the output
+        self._parse_chkdsk_output(output, result)
+
+        # Success if we got output and no critical errors
+        result.success = bool(output) and exit_code in [0, 1]  # 1 = errors found but completed
+
+    def _build_ps_command(self, drive_letter: str) -> str:
+        """Build the PowerShell script that runs chkdsk /scan"""
         # PowerShell script to run chkdsk with elevated privileges if needed
         # Note: /scan mode doesn't require elevation for read-only check
-        ps_command = f"""
+        return f"""
             $ErrorActionPreference = 'Continue'
             $output = chkdsk {drive_letter}: /scan 2>&1 | Out-String
             Write-Output $output
             exit $LASTEXITCODE
         """
 
-        process = subprocess.run(
-            [self.powershell_path, '-Command', ps_command],
-            capture_output=True,
-            text=True,
-            timeout=timeout_seconds
-        )
-
-        # Combine stdout and stderr
-        output = process.stdout
-        if process.stderr:
-            output += "\n--- STDERR ---\n" + process.stderr
+    def _run_chkdsk_wsl(self, drive_letter: str, timeout_seconds: int) -> tuple:
+        """Run chkdsk from WSL through the shared PowerShell host"""
+        if self._ps_host is None:
+            self._ps_host = PowerShellHost(self.powershell_path)
 
-        return output, process.returncode
+        # Note: /scan mode doesn't require elevation for read-only check
+        return self._ps_host.run(
+            f"chkdsk {drive_letter}: /scan 2>&1 | Out-String | Write-Output",
+            timeout_seconds
+        )
 
     def _run_chkdsk_windows(self, drive_letter: str, timeout_seconds: int) -> tuple:
         """Run chkdsk on native Windows"""
@@ -249,99 +409,36 @@ class ChkdskWrapper:
         if not output:
             return
 
-        lines = output.split('\n')
-        current_stage = None
-
-        for line in lines:
-            line = line.strip()
-
-            # Volume label and filesystem
-            if 'volume label is' in line.lower():
-                match = re.search(r'volume label is (.+)', line, re.IGNORECASE)
-                if match:
-                    result.volume_label = match.group(1).strip()
-
-            # Filesystem type
-            if 'file system is' in line.lower():
-                match = re.search(r'file system is (\w+)', line, re.IGNORECASE)
-                if match:
-                    result.filesystem_type = match.group(1).upper()
-
-            # Stage detection
-            stage_match = re.search(r'stage (\d+) of (\d+)', line, re.IGNORECASE)
-            if stage_match:
-                current_stage = {
-                    'stage_number': int(stage_match.group(1)),
-                    'total_stages': int(stage_match.group(2)),
-                    'description': line,
-                    'status': 'running'
-                }
-                result.stage_results.append(current_stage)
+        # Walk the lines in place rather than materializing a list of them
+        for line_match in _LINE_RE.finditer(output):
+            line = line_match.group().strip()
+            line_lower = line.lower()
+
+            for literal, pattern, handler in _LINE_HANDLERS:
+                if literal in line_lower:
+                    match = pattern.search(line)
+                    if match:
+                        handler(match, result)
 
             # Stage completion
-            if current_stage and 'percent complete' in line.lower():
-                if '100 percent' in line.lower():
-                    current_stage['status'] = 'completed'
-
-            # Bad sectors
-            bad_sectors_match = re.search(r'(\d+)\s+(?:KB|bytes)\s+in bad sectors', line, re.IGNORECASE)
-            if bad_sectors_match:
-                result.bad_sectors = int(bad_sectors_match.group(1))
-                if result.bad_sectors > 0:
-                    result.errors_found = True
-                    result.warnings.append(f"Bad sectors detected: {result.bad_sectors}")
-
-            # Total space
-            total_match = re.search(r'([\d,]+)\s+(?:KB|bytes|MB|GB)\s+total disk space', line, re.IGNORECASE)
-            if total_match:
-                value = int(total_match.group(1).replace(',', ''))
-                # Convert to bytes (assume KB if not specified)
-                if 'GB' in line.upper():
-                    result.total_bytes = value * 1024 * 1024 * 1024
-                elif 'MB' in line.upper():
-                    result.total_bytes = value * 1024 * 1024
-                elif 'KB' in line.upper():
-                    result.total_bytes = value * 1024
-                else:
-                    result.total_bytes = value
-
-            # Free space
-            free_match = re.search(r'([\d,]+)\s+(?:KB|bytes|MB|GB)\s+(?:are )?available', line, re.IGNORECASE)
-            if free_match:
-                value = int(free_match.group(1).replace(',', ''))
-                if 'GB' in line.upper():
-                    result.free_bytes = value * 1024 * 1024 * 1024
-                elif 'MB' in line.upper():
-                    result.free_bytes = value * 1024 * 1024
-                elif 'KB' in line.upper():
-                    result.free_bytes = value * 1024
-                else:
-                    result.free_bytes = value
-
-            # Allocation unit size
-            alloc_match = re.search(r'([\d,]+)\s+bytes\s+(?:in each )?allocation unit', line, re.IGNORECASE)
-            if alloc_match:
-                result.allocation_unit_bytes = int(alloc_match.group(1).replace(',', ''))
-
-            # Error detection keywords
-            error_keywords = [
-                'error', 'corrupt', 'damaged', 'failed', 'unreadable',
-                'lost chain', 'cross-linked', 'invalid'
-            ]
-            for keyword in error_keywords:
-                if keyword in line.lower() and 'no errors' not in line.lower():
-                    # Avoid false positives
-                    if not any(exclude in line.lower() for exclude in
-                              ['error-free', 'no errors found', 'windows has scanned']):
-                        result.errors_found = True
-                        if line not in result.warnings:
-                            result.warnings.append(line)
+            if result.stage_results and 'percent complete' in line_lower:
+                if '100 percent' in line_lower:
+                    result.stage_results[-1]['status'] = 'completed'
+
+            # Error detection keywords (excludes are checked first so
+            # benign lines skip the keyword scan entirely)
+            if ('no errors' not in line_lower
+                    and not any(exclude in line_lower for exclude in _ERROR_EXCLUDES)
+                    and any(keyword in line_lower for keyword in _ERROR_KEYWORDS)):
+                result.errors_found = True
+                if line not in result.warnings:
+                    result.warnings.append(line)
 
             # Clean completion messages
-            if 'windows has scanned the file system and found no problems' in line.lower():
+            if 'windows has scanned the file system and found no problems' in line_lower:
                 result.errors_found = False
 
-            if 'no further action is required' in line.lower():
+            if 'no further action is required' in line_lower:
                 result.errors_found = False
 
         # Calculate used bytes
@@ -361,20 +458,44 @@ def run_chkdsk(drive_path: str, timeout_seconds: int = 300) -> Dict[str, Any]:
         Dictionary with chkdsk results
     """
     wrapper = ChkdskWrapper()
-    result = wrapper.run_chkdsk(drive_path, timeout_seconds)
+    try:
+        result = wrapper.run_chkdsk(drive_path, timeout_seconds)
+    finally:
+        wrapper.close()
     return result.to_dict()
 
 
+def run_chkdsk_many(drive_paths: List[str], timeout_seconds: int = 300) -> List[Dict[str, Any]]:
+    """
+    Convenience function to run chkdsk on several drives concurrently.
+
+    On Windows the default event loop (Proactor) supports subprocesses.
+
+    Args:
+        drive_paths: Paths to drives (e.g., ['D:', 'E:'])
+        timeout_seconds: Maximum execution time per drive
+
+    Returns:
+        List of dictionaries with chkdsk results, in input order
+    """
+    wrapper = ChkdskWrapper()
+    results = asyncio.run(wrapper.run_chkdsk_many(drive_paths, timeout_seconds))
+    return [r.to_dict() for r in results]
+
+
 if __name__ == '__main__':
     import json
     import sys
 
     if len(sys.argv) < 2:
-        print("Usage: python chkdsk_wrapper.py <drive_path>")
+        print("Usage: python chkdsk_wrapper.py <drive_path> [drive_path ...]")
         print("Example: python chkdsk_wrapper.py /mnt/d")
         print("Example: python chkdsk_wrapper.py D:")
         sys.exit(1)
 
-    drive_path = sys.argv[1]
-    result = run_chkdsk(drive_path)
-    print(json.dumps(result, indent=2))
+    if len(sys.argv) > 2:
+        result = run_chkdsk_many(sys.argv[1:])
+    else:
+        result = run_chkdsk(sys.argv[1])
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write('\n')
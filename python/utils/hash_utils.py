@@ -2,31 +2,105 @@
 File Hashing Utilities for Duplicate Detection
 
 Provides two hashing strategies:
-1. Quick Hash: Fast preliminary check using first/last bytes + file size
+1. Quick Hash: Fast preliminary check using first/last bytes + file size (xxh3)
 2. SHA-256 Hash: Definitive content verification
 
 Quick hash is used for initial duplicate detection, SHA-256 confirms matches.
+
+Quick hash values carry a format prefix (QUICK_HASH_VERSION). Values from
+an older format never compare equal to current ones, so databases holding
+them must be re-hashed (populate_db.py does this) before duplicates across
+old and new scans can be found.
 """
 
+import errno
 import hashlib
+import mmap
 import os
+import threading
+from collections import OrderedDict, deque
 from pathlib import Path
-from typing import Optional, Tuple, Dict, Any
-from dataclasses import dataclass
+from typing import Optional, Tuple, Dict, Any, List, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, replace
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.logger import get_logger
+from core.compat import DATACLASS_SLOTS
+
+# Quick hashes need xxhash (see requirements.txt); guarded so importing
+# utils doesn't fail in code paths that never quick-hash
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 
 logger = get_logger(__name__)
 
 # Quick hash parameters
 QUICK_HASH_CHUNK_SIZE = 4096  # Bytes to read from start/end
+SHA256_CHUNK_SIZE = 1024 * 1024  # Read buffer for full-content SHA-256
+# Prefix on quick hash values. Bump whenever the algorithm or its inputs
+# change so values stored by older versions never match new ones.
+# Unprefixed values in existing databases are v1 (MD5); v2 was xxh3_128
+# with the size as decimal text.
+QUICK_HASH_VERSION = 'v3'  # xxh3_128, size as 8 little-endian bytes
 MIN_SIZE_FOR_QUICK_HASH = 64  # Files smaller than this use full content
+MMAP_MIN_SIZE = 10 * 1024 * 1024  # Hash files at least this large through mmap
+COMPARE_BLOCK_SIZE = 4 * 1024 * 1024  # Block size for byte-for-byte comparison
+HASH_CACHE_SIZE = 100_000  # hash_file results kept in memory, keyed by (path, mtime, size)
+QUICK_HASH_WORKERS = 32  # Concurrent quick-hash reads in iter_quick_hashes
+SHA256_WORKERS = 16  # Files hashed at once in iter_sha256_hashes
+SMALL_FILE_MAX_SIZE = 128 * 1024  # Read files up to this size once instead of per stage
+
+
+
+def _select_sha256_factory():
+    """
+    Pick the SHA-256 constructor once at import.
+
+    OpenSSL's implementation dispatches to SHA-NI / AVX2 code paths on
+    CPUs that have them. usedforsecurity=False (Python 3.9+) marks this as
+    a content fingerprint, so FIPS-mode OpenSSL builds don't refuse it.
+
+    New hashers are copies of a pristine template: copy() is a context
+    memcpy, several times cheaper than hashlib.new() per file.
+    """
+    try:
+        template = hashlib.new('sha256', usedforsecurity=False)
+    except TypeError:
+        template = hashlib.sha256()
+    return template.copy
+
+
+_sha256_factory = _select_sha256_factory()
+_xxh3_128_hexdigest = xxhash.xxh3_128_hexdigest if xxhash else None
+
+
+# Error messages for the common failures, shared rather than formatted per
+# file; scans of user directories can hit thousands of unreadable files
+_ERR_PERMISSION = sys.intern("Permission denied")
+_ERR_NOT_FOUND = sys.intern("File not found")
+_ERR_IS_DIRECTORY = sys.intern("Is a directory")
+_OS_ERROR_MESSAGES = {
+    errno.EACCES: _ERR_PERMISSION,
+    errno.EPERM: _ERR_PERMISSION,
+    errno.ENOENT: _ERR_NOT_FOUND,
+    errno.EISDIR: _ERR_IS_DIRECTORY,
+}
 
 
-@dataclass
+def _os_error_message(e: OSError) -> str:
+    """Map an OSError to its shared message, formatting only uncommon errors"""
+    message = _OS_ERROR_MESSAGES.get(e.errno)
+    if message is None:
+        return f"OS error: {e}"
+    return message
+
+
+@dataclass(**DATACLASS_SLOTS)
 class HashResult:
     """Result of a file hashing operation"""
     file_path: str
@@ -37,13 +111,74 @@ class HashResult:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return {
-            'file_path': self.file_path,
-            'file_size': self.file_size,
-            'quick_hash': self.quick_hash,
-            'sha256_hash': self.sha256_hash,
-            'error': self.error
-        }
+        return asdict(self)
+
+
+def _open_noatime(file_path: str) -> int:
+    """Open a file read-only, skipping atime updates where permitted"""
+    noatime = getattr(os, 'O_NOATIME', 0)
+    try:
+        return os.open(file_path, os.O_RDONLY | noatime)
+    except PermissionError as e:
+        # O_NOATIME is only allowed on files we own
+        if not noatime or e.errno != errno.EPERM:
+            raise
+        return os.open(file_path, os.O_RDONLY)
+
+
+def _read_head_and_tail(file_path: str, chunk_size: int) -> Tuple[int, bytes, bytes]:
+    """
+    Read the bytes that feed the quick hash.
+
+    Returns (file_size, head, tail): the whole file as head if it is at
+    most MIN_SIZE_FOR_QUICK_HASH, otherwise the first chunk and then either
+    the last chunk or, for files under two chunks, the remainder.
+
+    Uses positional reads where available, so no seek is needed.
+    """
+    if not hasattr(os, 'pread'):
+        # Windows: fall back to a buffered file object
+        file_size = os.path.getsize(file_path)
+        with open(file_path, 'rb') as f:
+            if file_size <= MIN_SIZE_FOR_QUICK_HASH:
+                return file_size, f.read(), b''
+            head = f.read(chunk_size)
+            if file_size > chunk_size * 2:
+                f.seek(-chunk_size, 2)  # Seek from end
+                return file_size, head, f.read(chunk_size)
+            return file_size, head, f.read()
+
+    fd = _open_noatime(file_path)
+    try:
+        file_size = os.fstat(fd).st_size
+        if file_size <= MIN_SIZE_FOR_QUICK_HASH:
+            return file_size, os.pread(fd, MIN_SIZE_FOR_QUICK_HASH, 0), b''
+        head = os.pread(fd, chunk_size, 0)
+        if file_size > chunk_size * 2:
+            return file_size, head, os.pread(fd, chunk_size, file_size - chunk_size)
+        # File is between MIN_SIZE and chunk_size*2: the remainder
+        return file_size, head, os.pread(fd, chunk_size, chunk_size)
+    finally:
+        os.close(fd)
+
+
+def _split_head_and_tail(data: bytes, chunk_size: int) -> Tuple[bytes, bytes]:
+    """Pick the quick-hash head and tail out of a fully read file, as _read_head_and_tail would"""
+    if len(data) <= MIN_SIZE_FOR_QUICK_HASH:
+        return data, b''
+    if len(data) > chunk_size * 2:
+        return data[:chunk_size], data[-chunk_size:]
+    return data[:chunk_size], data[chunk_size:]
+
+
+def _quick_hash_digest(file_size: int, head: bytes, tail: bytes) -> str:
+    """Combine file size, head and tail into a versioned quick hash value"""
+    # One-shot digest over the concatenation (file size first); same value
+    # as streaming the three parts through a hasher, with fewer calls
+    if _xxh3_128_hexdigest is None:
+        raise ImportError("Quick hashing requires the xxhash package (pip install -r requirements.txt)")
+    data = b''.join((file_size.to_bytes(8, 'little'), head, tail))
+    return f"{QUICK_HASH_VERSION}:{_xxh3_128_hexdigest(data)}"
 
 
 def compute_quick_hash(file_path: str, chunk_size: int = QUICK_HASH_CHUNK_SIZE) -> Tuple[Optional[str], Optional[str]]:
@@ -56,6 +191,8 @@ def compute_quick_hash(file_path: str, chunk_size: int = QUICK_HASH_CHUNK_SIZE)
     - Last N bytes (if file is large enough)
 
     This provides very fast duplicate candidate detection with low false positives.
+    The digest is a non-cryptographic xxh3_128, returned as
+    '<QUICK_HASH_VERSION>:<hex>'.
 
     Args:
         file_path: Path to the file
@@ -66,45 +203,79 @@ def compute_quick_hash(file_path: str, chunk_size: int = QUICK_HASH_CHUNK_SIZE)
         hash_value is None if there was an error
     """
     try:
-        file_size = os.path.getsize(file_path)
+        file_size, head, tail = _read_head_and_tail(file_path, chunk_size)
+        return _quick_hash_digest(file_size, head, tail), None
 
-        hasher = hashlib.md5()
+    except OSError as e:
+        return None, _os_error_message(e)
+    except ValueError as e:
+        # e.g. a path containing a NUL byte
+        return None, f"Invalid path: {e}"
 
-        # Include file size in hash
-        hasher.update(str(file_size).encode('utf-8'))
 
-        with open(file_path, 'rb') as f:
-            # For small files, hash entire content
-            if file_size <= MIN_SIZE_FOR_QUICK_HASH:
-                hasher.update(f.read())
-            else:
-                # Read first chunk
-                first_chunk = f.read(chunk_size)
-                hasher.update(first_chunk)
-
-                # Read last chunk (if file is large enough)
-                if file_size > chunk_size * 2:
-                    f.seek(-chunk_size, 2)  # Seek from end
-                    last_chunk = f.read(chunk_size)
-                    hasher.update(last_chunk)
-                else:
-                    # File is between MIN_SIZE and chunk_size*2
-                    # Read remaining content
-                    hasher.update(f.read())
+def iter_quick_hashes(file_paths: Iterable[str],
+                      max_workers: int = QUICK_HASH_WORKERS) -> Iterator[Tuple[Optional[str], Optional[str]]]:
+    """
+    Compute quick hashes for many files, keeping several reads in flight.
 
-        return hasher.hexdigest(), None
+    Each quick hash is two small reads, so a one-at-a-time loop leaves the
+    device idle between requests. Running them on a thread pool (pread
+    releases the GIL) keeps the device queue full. At most max_workers * 4
+    files are outstanding, so memory stays flat on very large scans.
 
-    except PermissionError:
-        return None, "Permission denied"
-    except FileNotFoundError:
-        return None, "File not found"
-    except OSError as e:
-        return None, f"OS error: {e}"
-    except Exception as e:
-        return None, f"Unexpected error: {e}"
+    Args:
+        file_paths: Paths to hash (may be a generator)
+        max_workers: Number of concurrent reader threads
+
+    Yields:
+        (hash_value, error_message) per path, in input order
+    """
+    return _iter_in_order(compute_quick_hash, file_paths, max_workers)
+
+
+def _iter_in_order(func, file_paths: Iterable[str], max_workers: int) -> Iterator[Any]:
+    """Run func over file_paths on a thread pool, yielding results in input order"""
+    window = max_workers * 4
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = deque()
+        for path in file_paths:
+            pending.append(pool.submit(func, path))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
 
 
-def compute_sha256(file_path: str, chunk_size: int = 65536) -> Tuple[Optional[str], Optional[str]]:
+def _fadvise(fd: int, advice: str) -> None:
+    """Pass a POSIX_FADV_* page cache hint for the whole file, where supported"""
+    if hasattr(os, 'posix_fadvise') and hasattr(os, advice):
+        try:
+            os.posix_fadvise(fd, 0, 0, getattr(os, advice))
+        except OSError:
+            pass  # Only a hint; some filesystems reject it
+
+
+def _update_from_mmap(hasher, f) -> bool:
+    """
+    Feed an open file to hasher through a read-only memory map.
+
+    Hashing straight from the page cache skips the per-chunk copy into
+    Python bytes objects. Returns False if the file can't be mapped (e.g.
+    some network filesystems), leaving the caller to fall back to reads.
+    """
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return False
+
+    with mm:
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        hasher.update(mm)
+    return True
+
+
+def compute_sha256(file_path: str, chunk_size: int = SHA256_CHUNK_SIZE) -> Tuple[Optional[str], Optional[str]]:
     """
     Compute SHA-256 hash of entire file content.
 
@@ -112,38 +283,123 @@ def compute_sha256(file_path: str, chunk_size: int = 65536) -> Tuple[Optional[st
 
     Args:
         file_path: Path to the file
-        chunk_size: Read buffer size (default 64KB)
+        chunk_size: Read buffer size (default 1MB)
 
     Returns:
         Tuple of (hash_value, error_message)
         hash_value is None if there was an error
     """
     try:
-        hasher = hashlib.sha256()
+        hasher = _sha256_factory()
 
         with open(file_path, 'rb') as f:
-            while True:
-                chunk = f.read(chunk_size)
-                if not chunk:
-                    break
-                hasher.update(chunk)
+            # Ask for aggressive readahead, and drop the pages afterwards so
+            # hashing a large file doesn't evict everything else from the cache
+            _fadvise(f.fileno(), 'POSIX_FADV_SEQUENTIAL')
+            try:
+                file_size = os.fstat(f.fileno()).st_size
+                if file_size >= MMAP_MIN_SIZE and _update_from_mmap(hasher, f):
+                    return hasher.hexdigest(), None
+
+                # Reuse one buffer rather than allocating a bytes object per chunk;
+                # hashlib releases the GIL while hashing large updates. Small
+                # files get a buffer just big enough to read them in one call.
+                buf = bytearray(min(chunk_size, file_size + 1))
+                view = memoryview(buf)
+                while True:
+                    n = f.readinto(buf)
+                    if not n:
+                        break
+                    hasher.update(view[:n])
+            finally:
+                _fadvise(f.fileno(), 'POSIX_FADV_DONTNEED')
 
         return hasher.hexdigest(), None
 
-    except PermissionError:
-        return None, "Permission denied"
-    except FileNotFoundError:
-        return None, "File not found"
     except OSError as e:
-        return None, f"OS error: {e}"
-    except Exception as e:
-        return None, f"Unexpected error: {e}"
+        return None, _os_error_message(e)
+    except ValueError as e:
+        # e.g. a path containing a NUL byte
+        return None, f"Invalid path: {e}"
+
+
+def iter_sha256_hashes(file_paths: Iterable[str],
+                       max_workers: int = SHA256_WORKERS) -> Iterator[Tuple[Optional[str], Optional[str]]]:
+    """
+    Compute SHA-256 for many files, hashing several at once.
+
+    On trees dominated by tiny files the per-file open/read/close dominates
+    the hashing itself. Keeping max_workers files in flight overlaps those
+    syscalls, and hashlib releases the GIL while hashing, so the digests
+    run in parallel too.
+
+    Args:
+        file_paths: Paths to hash (may be a generator)
+        max_workers: Number of concurrent hashing threads
+
+    Yields:
+        (hash_value, error_message) per path, in input order
+    """
+    return _iter_in_order(compute_sha256, file_paths, max_workers)
+
+
+# LRU of successful hash_file results; a changed mtime or size misses
+_hash_cache: 'OrderedDict[Tuple[str, int, int], HashResult]' = OrderedDict()
+_hash_cache_lock = threading.Lock()
+
+
+def _cache_get(key: Tuple[str, int, int], need_sha256: bool) -> Optional[HashResult]:
+    with _hash_cache_lock:
+        cached = _hash_cache.get(key)
+        if cached is None or (need_sha256 and not cached.sha256_hash):
+            return None
+        _hash_cache.move_to_end(key)
+        return replace(cached)
+
+
+def _cache_put(key: Tuple[str, int, int], result: HashResult) -> None:
+    with _hash_cache_lock:
+        _hash_cache[key] = replace(result)
+        _hash_cache.move_to_end(key)
+        if len(_hash_cache) > HASH_CACHE_SIZE:
+            _hash_cache.popitem(last=False)
+
+
+def clear_hash_cache() -> None:
+    """Drop all cached hash_file results"""
+    with _hash_cache_lock:
+        _hash_cache.clear()
+
+
+def _hash_small_file(file_path: str, result: HashResult) -> HashResult:
+    """
+    Fill in both hashes for a small file from a single read.
+
+    The quick hash is computed from the same bytes compute_quick_hash
+    would read, so values match files hashed the regular way.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        result.error = _os_error_message(e)
+        return result
+
+    head, tail = _split_head_and_tail(data, QUICK_HASH_CHUNK_SIZE)
+    result.quick_hash = _quick_hash_digest(len(data), head, tail)
+    hasher = _sha256_factory()
+    hasher.update(data)
+    result.sha256_hash = hasher.hexdigest()
+    return result
 
 
 def hash_file(file_path: str, compute_sha256_hash: bool = False) -> HashResult:
     """
     Hash a file with optional full SHA-256.
 
+    Results are cached in memory per (path, mtime, size), so re-hashing an
+    unchanged file in the same process skips all reads.
+
     Args:
         file_path: Path to the file
         compute_sha256_hash: Also compute SHA-256 (slower but definitive)
@@ -157,11 +413,24 @@ def hash_file(file_path: str, compute_sha256_hash: bool = False) -> HashResult:
     )
 
     try:
-        result.file_size = os.path.getsize(file_path)
-    except Exception as e:
+        st = os.stat(file_path)
+    except (OSError, ValueError) as e:
         result.error = f"Could not get file size: {e}"
         return result
 
+    result.file_size = st.st_size
+    cache_key = (file_path, st.st_mtime_ns, st.st_size)
+    cached = _cache_get(cache_key, compute_sha256_hash)
+    if cached:
+        return cached
+
+    # Small files: one read feeds both hashes
+    if compute_sha256_hash and st.st_size <= SMALL_FILE_MAX_SIZE:
+        _hash_small_file(file_path, result)
+        if not result.error:
+            _cache_put(cache_key, result)
+        return result
+
     # Compute quick hash
     quick_hash, error = compute_quick_hash(file_path)
     if error:
@@ -174,20 +443,39 @@ def hash_file(file_path: str, compute_sha256_hash: bool = False) -> HashResult:
         sha256, error = compute_sha256(file_path)
         if error:
             result.error = f"SHA-256 failed: {error}"
-        else:
-            result.sha256_hash = sha256
+            return result
+        result.sha256_hash = sha256
 
+    _cache_put(cache_key, result)
     return result
 
 
+def _contents_equal(file1_path: str, file2_path: str, block_size: int = COMPARE_BLOCK_SIZE) -> bool:
+    """
+    Compare two files' contents, stopping at the first differing block.
+
+    Cheaper than hashing both files: equal files cost the same I/O with no
+    hash computation, and differing files stop early.
+    """
+    with open(file1_path, 'rb') as f1, open(file2_path, 'rb') as f2:
+        while True:
+            block1 = f1.read(block_size)
+            if block1 != f2.read(block_size):
+                return False
+            if not block1:
+                return True
+
+
 def files_are_duplicates(file1_path: str, file2_path: str) -> Tuple[bool, str]:
     """
     Check if two files are exact duplicates.
 
     Uses a multi-stage comparison:
     1. Compare file sizes (fast fail)
-    2. Compare quick hashes (fast candidate confirmation)
-    3. Compare SHA-256 hashes (definitive confirmation)
+    2. Compare quick hashes (fast candidate confirmation; skipped for
+       files up to SMALL_FILE_MAX_SIZE, where it would read most of the
+       same bytes as stage 3)
+    3. Compare contents block by block (definitive confirmation)
 
     Args:
         file1_path: Path to first file
@@ -205,28 +493,30 @@ def files_are_duplicates(file1_path: str, file2_path: str) -> Tuple[bool, str]:
             return False, "Different file sizes"
 
         # Stage 2: Quick hash comparison
-        qh1, err1 = compute_quick_hash(file1_path)
-        qh2, err2 = compute_quick_hash(file2_path)
-
-        if err1 or err2:
-            return False, f"Hash error: {err1 or err2}"
-
-        if qh1 != qh2:
-            return False, "Quick hash mismatch"
-
-        # Stage 3: SHA-256 comparison for definitive answer
-        sha1, err1 = compute_sha256(file1_path)
-        sha2, err2 = compute_sha256(file2_path)
-
-        if err1 or err2:
-            return False, f"SHA-256 error: {err1 or err2}"
-
-        if sha1 == sha2:
-            return True, "SHA-256 match confirmed"
+        if size1 > SMALL_FILE_MAX_SIZE:
+            qh1, err1 = compute_quick_hash(file1_path)
+            qh2, err2 = compute_quick_hash(file2_path)
+
+            if err1 or err2:
+                return False, f"Hash error: {err1 or err2}"
+
+            if qh1 != qh2:
+                return False, "Quick hash mismatch"
+
+        # Stage 3: Byte-for-byte comparison for definitive answer
+        try:
+            identical = _contents_equal(file1_path, file2_path)
+        except OSError as e:
+            return False, f"Read error: {e}"
+
+        if identical:
+            return True, "Byte-for-byte match confirmed"
+        elif size1 <= SMALL_FILE_MAX_SIZE:
+            return False, "Content mismatch"
         else:
-            return False, "SHA-256 mismatch (hash collision in quick hash)"
+            return False, "Content mismatch (hash collision in quick hash)"
 
-    except Exception as e:
+    except (OSError, ValueError) as e:
         return False, f"Comparison error: {e}"
 
 
@@ -261,6 +551,41 @@ def parse_composite_key(key: str) -> Tuple[int, str]:
     return int(parts[0]), parts[1]
 
 
+def generate_composite_keys(file_sizes: Iterable[int], quick_hashes: Iterable[str]) -> List[str]:
+    """
+    Generate composite keys for many files at once.
+
+    Equivalent to calling generate_composite_key per pair, without the
+    per-call overhead when grouping large catalogs.
+
+    Args:
+        file_sizes: File sizes in bytes
+        quick_hashes: Quick hash values, parallel to file_sizes
+
+    Returns:
+        List of composite key strings
+    """
+    return [f"{size}:{quick_hash}" for size, quick_hash in zip(file_sizes, quick_hashes)]
+
+
+def parse_composite_keys(keys: Iterable[str]) -> List[Tuple[int, str]]:
+    """
+    Parse many composite keys back to (size, hash) pairs.
+
+    Args:
+        keys: Composite key strings
+
+    Returns:
+        List of (file_size, quick_hash) tuples
+    """
+    parsed = []
+    append = parsed.append
+    for key in keys:
+        size, quick_hash = key.split(':', 1)
+        append((int(size), quick_hash))
+    return parsed
+
+
 if __name__ == '__main__':
     import argparse
     import json
@@ -288,7 +613,8 @@ if __name__ == '__main__':
     else:
         result = hash_file(args.file_path, compute_sha256_hash=args.sha256)
         if args.json:
-            print(json.dumps(result.to_dict(), indent=2))
+            json.dump(result.to_dict(), sys.stdout, indent=2)
+            sys.stdout.write('\n')
         else:
             print(f"File: {result.file_path}")
             print(f"Size: {result.file_size:,} bytes")
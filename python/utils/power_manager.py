@@ -7,14 +7,31 @@ with specific support for WSL environments where we need to prevent Windows from
 
 import os
 import subprocess
-import platform
+import time
 from contextlib import contextmanager
 from typing import Optional
 
 from core.logger import get_logger
+from core.wsl import is_wsl
 
 logger = get_logger(__name__)
 
+# The sleep prevention script records its Windows PID next to itself
+_PREVENT_SLEEP_SCRIPT = '/tmp/prevent_sleep.ps1'
+_PREVENT_SLEEP_PID_FILE = '/tmp/prevent_sleep.pid'
+# How long allow_sleep() waits for a just-started script to record its PID
+_PID_FILE_WAIT_SECONDS = 5.0
+_PID_FILE_POLL_INTERVAL = 0.1
+
+# Fallback when no PID was recorded. Get-Process has no CommandLine on
+# Windows PowerShell 5.1, so match through CIM; skip this process, whose own
+# command line contains the pattern.
+_STOP_PREVENT_SLEEP_PS = (
+    "Get-CimInstance Win32_Process -Filter \"CommandLine LIKE '%prevent_sleep.ps1%'\" | "
+    "Where-Object { $_.ProcessId -ne $PID } | "
+    "ForEach-Object { Stop-Process -Id $_.ProcessId -Force }"
+)
+
 
 class PowerManager:
     """
@@ -25,24 +42,11 @@ class PowerManager:
     """
     
     def __init__(self):
-        self.is_wsl = self._detect_wsl()
+        self.is_wsl = is_wsl()
         self.original_settings: Optional[dict] = None
         self._prevented = False
+        self._wsl_proc: Optional[subprocess.Popen] = None
         
-    def _detect_wsl(self) -> bool:
-        """Detect if running in WSL"""
-        try:
-            # Check for WSL-specific indicators
-            if platform.system() == 'Linux':
-                # Check /proc/version for Microsoft/WSL
-                with open('/proc/version', 'r') as f:
-                    version_info = f.read().lower()
-                    if 'microsoft' in version_info or 'wsl' in version_info:
-                        return True
-        except Exception:
-            pass
-        return False
-    
     def prevent_sleep(self):
         """
         Prevent system from sleeping.
@@ -86,6 +90,9 @@ class PowerManager:
         """Prevent Windows from sleeping (called from WSL)"""
         # Create a PowerShell script that prevents sleep
         ps_script = """
+# Record our PID so allow_sleep() can stop us directly
+Set-Content -Path (Join-Path $PSScriptRoot 'prevent_sleep.pid') -Value $PID -Encoding Ascii
+
 $code = @'
 [DllImport("kernel32.dll", CharSet = CharSet.Auto, SetLastError = true)]
 public static extern uint SetThreadExecutionState(uint esFlags);
@@ -102,16 +109,17 @@ if ($result -eq 0) {
     exit 1
 }
 
-# Keep the process alive - this will be killed when the parent process ends
-while ($true) {
-    Start-Sleep -Seconds 30
-    # Reset the state periodically to ensure it stays active
-    $ste::SetThreadExecutionState(0x80000041)
-}
+# ES_CONTINUOUS keeps the request active until this thread exits, so there is
+# nothing to re-arm. Block without waking until the process is stopped.
+[System.Threading.Thread]::Sleep([System.Threading.Timeout]::Infinite)
 """
         
         # Write script to temp file
-        script_path = '/tmp/prevent_sleep.ps1'
+        script_path = _PREVENT_SLEEP_SCRIPT
+        try:
+            os.remove(_PREVENT_SLEEP_PID_FILE)
+        except FileNotFoundError:
+            pass
         with open(script_path, 'w') as f:
             f.write(ps_script)
         
@@ -125,7 +133,7 @@ while ($true) {
         
         # Launch PowerShell script in background
         # It will automatically terminate when our Python process ends
-        subprocess.Popen(
+        self._wsl_proc = subprocess.Popen(
             ['powershell.exe', '-ExecutionPolicy', 'Bypass', '-File', windows_script_path],
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
@@ -136,16 +144,61 @@ while ($true) {
     
     def _allow_sleep_wsl(self):
         """Allow Windows to sleep again"""
-        # Kill any running prevent_sleep PowerShell processes
         try:
-            subprocess.run(
-                ['powershell.exe', '-Command', 
-                 "Get-Process | Where-Object {$_.CommandLine -like '*prevent_sleep.ps1*'} | Stop-Process -Force"],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL
-            )
+            pid = self._wait_for_prevent_sleep_pid()
+            if pid is not None:
+                # Kill the script by PID - no PowerShell startup or process scan
+                subprocess.run(
+                    ['taskkill.exe', '/PID', str(pid), '/F'],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL
+                )
+                os.remove(_PREVENT_SLEEP_PID_FILE)
+            else:
+                # Script never recorded its PID; kill any running prevent_sleep PowerShell processes
+                subprocess.run(
+                    ['powershell.exe', '-NoProfile', '-Command', _STOP_PREVENT_SLEEP_PS],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL
+                )
         except Exception as e:
             logger.debug(f"Error stopping sleep prevention: {e}")
+        finally:
+            self._reap_wsl_proc()
+
+    def _read_prevent_sleep_pid(self) -> Optional[int]:
+        """Read the Windows PID written by the sleep prevention script, if any"""
+        try:
+            with open(_PREVENT_SLEEP_PID_FILE, 'r', encoding='utf-8-sig') as f:
+                return int(f.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def _wait_for_prevent_sleep_pid(self) -> Optional[int]:
+        """
+        Read the script's PID, polling briefly if it hasn't been written yet.
+
+        allow_sleep() can run right after prevent_sleep(), before PowerShell
+        has started the script. Stops waiting early if the launcher exits.
+        """
+        deadline = time.monotonic() + _PID_FILE_WAIT_SECONDS
+        while True:
+            pid = self._read_prevent_sleep_pid()
+            if pid is not None or time.monotonic() >= deadline:
+                return pid
+            if self._wsl_proc is not None and self._wsl_proc.poll() is not None:
+                return self._read_prevent_sleep_pid()
+            time.sleep(_PID_FILE_POLL_INTERVAL)
+
+    def _reap_wsl_proc(self):
+        """Wait for the WSL-side powershell.exe wrapper so it doesn't linger"""
+        if self._wsl_proc is None:
+            return
+        try:
+            self._wsl_proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._wsl_proc.kill()
+        self._wsl_proc = None
     
     def _prevent_sleep_linux(self):
         """Prevent Linux system from sleeping"""
@@ -0,0 +1,146 @@
+"""
+Persistent PowerShell host.
+
+Keeps one powershell.exe process alive and feeds it commands over stdin,
+so callers that run many commands only pay the process startup once.
+"""
+
+import base64
+import queue
+import subprocess
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Optional, Tuple
+
+# Recent stderr lines kept for diagnostics
+STDERR_TAIL_LINES = 200
+
+
+class PowerShellHost:
+    """
+    A long-lived PowerShell process that runs commands sent over stdin.
+
+    Starting powershell.exe costs hundreds of milliseconds, so sequential
+    chkdsk runs and registry reads share one host instead of spawning a
+    process per call.
+    Each command is followed by a unique sentinel line carrying
+    $LASTEXITCODE, which marks the end of that command's output.
+
+    Only stdout is returned to callers, so parsers (e.g. JSON from the
+    registry reader) never see error or warning text. stderr is drained on
+    its own thread and its last lines are kept in stderr_tail.
+    """
+
+    def __init__(self, powershell_path: str):
+        self.powershell_path = powershell_path
+        self._process: Optional[subprocess.Popen] = None
+        self._lines: Optional[queue.Queue] = None
+        self.stderr_tail: deque = deque(maxlen=STDERR_TAIL_LINES)
+
+    def _start(self) -> None:
+        """Spawn the PowerShell process and its stdout/stderr reader threads"""
+        self._process = subprocess.Popen(
+            [self.powershell_path, '-NoProfile', '-NoLogo', '-NonInteractive', '-Command', '-'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            # chkdsk writes in the OEM codepage; undecodable bytes must not
+            # kill the reader threads
+            errors='replace',
+            bufsize=1
+        )
+        self._lines = queue.Queue()
+        threading.Thread(
+            target=self._pump, args=(self._process.stdout, self._lines), daemon=True
+        ).start()
+        # Drain stderr so a chatty command can't fill the pipe and stall the host
+        threading.Thread(
+            target=self._drain, args=(self._process.stderr, self.stderr_tail), daemon=True
+        ).start()
+
+    @staticmethod
+    def _pump(stream, lines: queue.Queue) -> None:
+        """Forward stdout lines to the queue; None signals EOF"""
+        try:
+            for line in stream:
+                lines.put(line)
+        finally:
+            # Always signal EOF so run() doesn't wait out its timeout
+            lines.put(None)
+
+    @staticmethod
+    def _drain(stream, tail: deque) -> None:
+        """Keep the most recent stderr lines until EOF"""
+        try:
+            for line in stream:
+                tail.append(line)
+        except (OSError, ValueError):
+            # Stream closed underneath us by close()
+            pass
+
+    def run(self, command: str, timeout_seconds: float) -> Tuple[str, int]:
+        """
+        Run a single-line PowerShell command and collect its output.
+
+        Raises:
+            subprocess.TimeoutExpired: if the sentinel is not seen in time.
+                The host is closed so the next call starts a fresh one.
+        """
+        if self._process is None or self._process.poll() is not None:
+            self._start()
+
+        sentinel = f"##DONE-{uuid.uuid4().hex}##"
+        # Progress records would otherwise be rendered into the output streams
+        self._process.stdin.write(
+            f"$ProgressPreference = 'SilentlyContinue'; {command}; "
+            f'Write-Output "{sentinel}$LASTEXITCODE"\n'
+        )
+        self._process.stdin.flush()
+
+        output = []
+        deadline = time.monotonic() + timeout_seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                line = self._lines.get(timeout=max(remaining, 0))
+            except queue.Empty:
+                self.close()
+                raise subprocess.TimeoutExpired(self.powershell_path, timeout_seconds)
+
+            if line is None:
+                # PowerShell exited before finishing the command
+                self.close()
+                return ''.join(output), -1
+
+            if line.startswith(sentinel):
+                code = line[len(sentinel):].strip()
+                return ''.join(output), int(code) if code.lstrip('-').isdigit() else -1
+
+            output.append(line)
+
+    def run_script(self, script: str, timeout_seconds: float) -> Tuple[str, int]:
+        """
+        Run a multi-line PowerShell script and collect its output.
+
+        The host reads one command per line, so the script is sent
+        base64-encoded and run as a script block.
+        """
+        encoded = base64.b64encode(script.encode('utf-8')).decode('ascii')
+        command = ("& ([scriptblock]::Create([Text.Encoding]::UTF8.GetString("
+                   f"[Convert]::FromBase64String('{encoded}'))))")
+        return self.run(command, timeout_seconds)
+
+    def close(self) -> None:
+        """Terminate the PowerShell process if it is running"""
+        if self._process is None:
+            return
+        try:
+            self._process.stdin.close()
+            self._process.terminate()
+            self._process.wait(timeout=5)
+        except Exception:
+            self._process.kill()
+        self._process = None
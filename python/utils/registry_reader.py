@@ -9,11 +9,15 @@ Works from both Windows native and WSL environments.
 
 import os
 import re
+import json
+import functools
+import base64
 import struct
 import platform
 import subprocess
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Tuple, Mapping, Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
 
@@ -21,17 +25,154 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.logger import get_logger
+from core.compat import DATACLASS_SLOTS
+from core.wsl import is_wsl
+from utils.powershell_host import PowerShellHost
 
 logger = get_logger(__name__)
 
+# WSL mount paths like /mnt/d or /mnt/d/...
+_WSL_MNT_RE = re.compile(r'^/mnt/([a-zA-Z])(?:/|$)')
+
+_IS_WINDOWS = platform.system() == 'Windows'
+
+
+@functools.lru_cache(maxsize=1)
+def _find_powershell() -> Optional[str]:
+    """Find PowerShell executable (cached for the life of the process)"""
+    if _IS_WINDOWS:
+        return 'powershell.exe'
+    elif is_wsl():
+        paths = [
+            '/mnt/c/Windows/System32/WindowsPowerShell/v1.0/powershell.exe',
+            '/mnt/c/Program Files/PowerShell/7/pwsh.exe',
+        ]
+        for path in paths:
+            if os.path.exists(path):
+                return path
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def _find_regexe() -> Optional[str]:
+    """Find reg.exe (cached for the life of the process)"""
+    if _IS_WINDOWS:
+        return 'reg.exe'
+    elif is_wsl():
+        path = '/mnt/c/Windows/System32/reg.exe'
+        if os.path.exists(path):
+            return path
+    return None
+
+
+# One value line of `reg query` output: "    Name    REG_TYPE    Data"
+_REG_QUERY_VALUE_RE = re.compile(r'^    (.*?)    (REG_[A-Z_]+)(?:    (.*))?$')
+
+_UINT32_LE = struct.Struct('<I').unpack_from
+_UINT32_BE = struct.Struct('>I').unpack_from
+_UINT64_LE = struct.Struct('<Q').unpack_from
+
+# REG_SZ / REG_MULTI_SZ terminator
+_NUL = '\x00'
+
+
+def _parse_sz(data: bytes) -> str:
+    try:
+        return data.decode('utf-16-le').rstrip(_NUL)
+    except UnicodeDecodeError:
+        return data.decode('utf-8', errors='replace').rstrip(_NUL)
+
+
+def _parse_multi_sz(data: bytes) -> List[str]:
+    try:
+        decoded = data.decode('utf-16-le')
+        return list(filter(None, decoded.split(_NUL)))
+    except UnicodeDecodeError:
+        return [data.decode('utf-8', errors='replace')]
+
+
+def _parse_dword(data: bytes) -> Optional[int]:
+    return _UINT32_LE(data)[0] if len(data) >= 4 else None
+
+
+def _parse_dword_big_endian(data: bytes) -> Optional[int]:
+    return _UINT32_BE(data)[0] if len(data) >= 4 else None
+
+
+def _parse_qword(data: bytes) -> Optional[int]:
+    return _UINT64_LE(data)[0] if len(data) >= 8 else None
+
+
+def _parse_default(data: bytes) -> Optional[str]:
+    return data.hex() if data else None
+
+
+# Registry value type code -> decoder
+_VALUE_PARSERS = {
+    1: _parse_sz,                 # REG_SZ
+    2: _parse_sz,                 # REG_EXPAND_SZ
+    3: bytes.hex,                 # REG_BINARY
+    4: _parse_dword,              # REG_DWORD
+    5: _parse_dword_big_endian,   # REG_DWORD_BIG_ENDIAN
+    7: _parse_multi_sz,           # REG_MULTI_SZ
+    11: _parse_qword,             # REG_QWORD
+}
+
+
+def _parse_value_data(value_type: int, data: bytes) -> Any:
+    """Parse registry value data based on type"""
+    return _VALUE_PARSERS.get(value_type, _parse_default)(data)
+
+
+# .NET RegistryValueKind name (PowerShell path) -> REG_* type name
+_VALUE_KIND_TYPES = {
+    'None': 'REG_NONE',
+    'String': 'REG_SZ',
+    'ExpandString': 'REG_EXPAND_SZ',
+    'Binary': 'REG_BINARY',
+    'DWord': 'REG_DWORD',
+    'MultiString': 'REG_MULTI_SZ',
+    'QWord': 'REG_QWORD',
+    'Unknown': 'REG_NONE',
+}
+_UNSIGNED_RANGE = {'REG_DWORD': 1 << 32, 'REG_QWORD': 1 << 64}
+
+# Marks a RegistryValue whose data hasn't been decoded from raw_data yet
+_UNDECODED = object()
+
 
-@dataclass
 class RegistryValue:
-    """A registry value with its data"""
-    name: str
-    value_type: str
-    data: Any
-    raw_data: Optional[bytes] = None
+    """
+    A registry value with its data.
+
+    Values read from raw hive bytes (hivex) carry raw_data and reg_type and
+    are decoded on first access to data, so reading a key with many values
+    only pays for the ones callers look at.
+    """
+    __slots__ = ('name', 'value_type', 'raw_data', 'reg_type', '_data')
+
+    def __init__(self, name: str, value_type: str, data: Any = _UNDECODED,
+                 raw_data: Optional[bytes] = None, reg_type: Optional[int] = None):
+        self.name = name
+        self.value_type = value_type
+        self.raw_data = raw_data
+        self.reg_type = reg_type
+        self._data = data
+
+    @property
+    def data(self) -> Any:
+        if self._data is _UNDECODED:
+            if self.raw_data is None:
+                self._data = None
+            else:
+                try:
+                    self._data = _parse_value_data(self.reg_type, self.raw_data)
+                except Exception as e:
+                    self._data = f"<error: {e}>"
+        return self._data
+
+    def __repr__(self) -> str:
+        return f"RegistryValue(name={self.name!r}, value_type={self.value_type!r}, data={self.data!r})"
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -43,22 +184,45 @@ class RegistryValue:
 
 @dataclass
 class RegistryKey:
-    """A registry key with its values and subkeys"""
+    """
+    A registry key with its values and subkeys.
+
+    Readers populate a key and RegistryReader.read_keys freezes it before
+    returning it, so the to_dict cache can't go stale. Each to_dict call
+    returns its own copy of the cached dict.
+    """
     path: str
-    values: Dict[str, RegistryValue] = field(default_factory=dict)
-    subkeys: List[str] = field(default_factory=list)
+    values: Mapping[str, RegistryValue] = field(default_factory=dict)
+    subkeys: Sequence[str] = field(default_factory=list)
     last_modified: Optional[datetime] = None
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    def freeze(self) -> None:
+        """Make values and subkeys read-only once the key is populated"""
+        self.values = MappingProxyType(dict(self.values))
+        self.subkeys = tuple(self.subkeys)
+        self._dict_cache = None
 
     def to_dict(self) -> Dict[str, Any]:
+        cached = self._dict_cache
+        if cached is None:
+            cached = {
+                'path': self.path,
+                'values': {k: v.to_dict() for k, v in self.values.items()},
+                'subkeys': self.subkeys,
+                'last_modified': self.last_modified.isoformat() if self.last_modified else None
+            }
+            # Keys still being populated may change; only cache frozen ones
+            if isinstance(self.subkeys, tuple):
+                self._dict_cache = cached
         return {
-            'path': self.path,
-            'values': {k: v.to_dict() for k, v in self.values.items()},
-            'subkeys': self.subkeys,
-            'last_modified': self.last_modified.isoformat() if self.last_modified else None
+            **cached,
+            'values': {k: dict(v) for k, v in cached['values'].items()},
+            'subkeys': list(cached['subkeys'])
         }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class RegistryReadResult:
     """Result of a registry read operation"""
     success: bool = False
@@ -80,10 +244,10 @@ class RegistryReader:
     """
     Reads Windows Registry hives from offline drives.
 
-    Supports multiple methods:
-    1. PowerShell reg.exe load/query/unload (requires elevation on Windows)
-    2. PowerShell direct hive reading
-    3. Python hivex library if available (pure Python, no elevation)
+    Supports multiple methods, tried in this order:
+    1. Python regipy library if available (pure Python hive parser, no elevation)
+    2. Python hivex library if available (no elevation)
+    3. PowerShell reg.exe load/query/unload (requires elevation on Windows)
 
     The registry hives are located at:
     - HKLM\\SOFTWARE -> Windows\\System32\\config\\SOFTWARE
@@ -115,40 +279,38 @@ class RegistryReader:
             drive_path: Path to the mounted drive (e.g., '/mnt/d', 'D:')
         """
         self.drive_path = Path(drive_path)
-        self.is_wsl = self._detect_wsl()
-        self.is_windows = platform.system() == 'Windows'
-        self.powershell_path = self._find_powershell()
+        self.is_wsl = is_wsl()
+        self.is_windows = _IS_WINDOWS
+        self.powershell_path = _find_powershell()
+        self.regexe_path = _find_regexe()
+        self._regipy_available = self._check_regipy()
         self._hivex_available = self._check_hivex()
+        self._ps_host: Optional[PowerShellHost] = None
+        # Parsed regipy hives, reused across reads of the same hive
+        self._regipy_hives: Dict[str, Any] = {}
+        self._config_listing: Optional[Dict[str, str]] = None
 
         logger.debug(f"RegistryReader initialized for {drive_path}")
         logger.debug(f"  WSL: {self.is_wsl}, Windows: {self.is_windows}")
         logger.debug(f"  PowerShell: {self.powershell_path}")
+        logger.debug(f"  reg.exe: {self.regexe_path}")
+        logger.debug(f"  Regipy available: {self._regipy_available}")
         logger.debug(f"  Hivex available: {self._hivex_available}")
 
-    def _detect_wsl(self) -> bool:
-        """Detect if running in WSL"""
+    def close(self) -> None:
+        """Shut down the shared PowerShell host and drop cached hives"""
+        if self._ps_host:
+            self._ps_host.close()
+            self._ps_host = None
+        self._regipy_hives.clear()
+
+    def _check_regipy(self) -> bool:
+        """Check if regipy library is available"""
         try:
-            if platform.system() == 'Linux':
-                with open('/proc/version', 'r') as f:
-                    version_info = f.read().lower()
-                    return 'microsoft' in version_info or 'wsl' in version_info
-        except Exception:
-            pass
-        return False
-
-    def _find_powershell(self) -> Optional[str]:
-        """Find PowerShell executable"""
-        if self.is_windows:
-            return 'powershell.exe'
-        elif self.is_wsl:
-            paths = [
-                '/mnt/c/Windows/System32/WindowsPowerShell/v1.0/powershell.exe',
-                '/mnt/c/Program Files/PowerShell/7/pwsh.exe',
-            ]
-            for path in paths:
-                if os.path.exists(path):
-                    return path
-        return None
+            import regipy
+            return True
+        except ImportError:
+            return False
 
     def _check_hivex(self) -> bool:
         """Check if hivex library is available"""
@@ -168,23 +330,35 @@ class RegistryReader:
         Returns:
             Path to the hive file or None if not found
         """
-        config_path = self.drive_path / 'Windows' / 'System32' / 'config'
-
-        if not config_path.exists():
-            logger.warning(f"Config path not found: {config_path}")
+        entries = self._config_entries()
+        if entries is None:
             return None
 
-        hive_file = config_path / hive_name
-        if hive_file.exists():
-            return hive_file
+        hive_file = entries.get(hive_name.lower())
+        if hive_file is None:
+            logger.warning(f"Hive file not found: {hive_name}")
+            return None
+        return Path(hive_file)
 
-        # Try lowercase
-        hive_file = config_path / hive_name.lower()
-        if hive_file.exists():
-            return hive_file
+    def _config_entries(self) -> Optional[Dict[str, str]]:
+        """
+        List Windows/System32/config once, as {lowercased name: path}.
 
-        logger.warning(f"Hive file not found: {hive_file}")
-        return None
+        Hive lookups then cost a dict probe instead of several stat calls,
+        which are slow on WSL's drvfs mounts. Returns None if the config
+        directory doesn't exist.
+        """
+        if self._config_listing is None:
+            config_path = self.drive_path / 'Windows' / 'System32' / 'config'
+            try:
+                with os.scandir(config_path) as it:
+                    self._config_listing = {
+                        entry.name.lower(): entry.path for entry in it if entry.is_file()
+                    }
+            except OSError:
+                logger.warning(f"Config path not found: {config_path}")
+                return None
+        return self._config_listing
 
     def _extract_drive_letter(self) -> Optional[str]:
         """Extract Windows drive letter from drive path"""
@@ -195,7 +369,7 @@ class RegistryReader:
             return path_str[0].upper()
 
         # Handle WSL paths like /mnt/d
-        match = re.match(r'^/mnt/([a-zA-Z])(?:/|$)', path_str)
+        match = _WSL_MNT_RE.match(path_str)
         if match:
             return match.group(1).upper()
 
@@ -212,138 +386,363 @@ class RegistryReader:
         Returns:
             RegistryReadResult with key data or error
         """
-        result = RegistryReadResult()
+        return self.read_keys(hive, [key_path])[key_path]
 
-        # Try hivex first (no elevation required)
-        if self._hivex_available:
-            hivex_result = self._read_with_hivex(hive, key_path)
-            if hivex_result.success:
-                return hivex_result
-            logger.debug(f"Hivex method failed: {hivex_result.error}")
+    def read_keys(self, hive: str, key_paths: List[str]) -> Dict[str, RegistryReadResult]:
+        """
+        Read several registry keys from one offline hive.
+
+        The hive is opened (hivex) or loaded with reg load (reg.exe,
+        PowerShell) once for all keys, rather than once per key.
+
+        Args:
+            hive: Hive name ('SOFTWARE', 'SYSTEM', etc.)
+            key_paths: Paths within the hive
+
+        Returns:
+            Dictionary mapping each key path to its RegistryReadResult
+        """
+        results: Dict[str, RegistryReadResult] = {}
+        pending = list(dict.fromkeys(key_paths))
+
+        # Try regipy first (pure Python, no elevation required)
+        if self._regipy_available and pending:
+            for key_path, regipy_result in self._read_with_regipy(hive, pending).items():
+                if regipy_result.success:
+                    results[key_path] = regipy_result
+                else:
+                    logger.debug(f"Regipy method failed: {regipy_result.error}")
+            pending = [kp for kp in pending if kp not in results]
+
+        # Then hivex (no elevation required)
+        if self._hivex_available and pending:
+            for key_path, hivex_result in self._read_with_hivex(hive, pending).items():
+                if hivex_result.success:
+                    results[key_path] = hivex_result
+                else:
+                    logger.debug(f"Hivex method failed: {hivex_result.error}")
+            pending = [kp for kp in pending if kp not in results]
+
+        # Then reg.exe, far cheaper to spawn than PowerShell
+        if self.regexe_path and pending:
+            for key_path, regexe_result in self._read_with_regexe(hive, pending).items():
+                if regexe_result.success:
+                    results[key_path] = regexe_result
+                else:
+                    logger.debug(f"reg.exe method failed: {regexe_result.error}")
+            pending = [kp for kp in pending if kp not in results]
 
         # Try PowerShell method
-        if self.powershell_path:
-            ps_result = self._read_with_powershell(hive, key_path)
-            if ps_result.success:
-                return ps_result
-            logger.debug(f"PowerShell method failed: {ps_result.error}")
+        if self.powershell_path and pending:
+            for key_path, ps_result in self._read_with_powershell(hive, pending).items():
+                if ps_result.success:
+                    results[key_path] = ps_result
+                else:
+                    logger.debug(f"PowerShell method failed: {ps_result.error}")
+            pending = [kp for kp in pending if kp not in results]
 
-        result.error = "No available method could read the registry"
-        return result
+        for result in results.values():
+            result.key.freeze()
+
+        for key_path in pending:
+            results[key_path] = RegistryReadResult(
+                error="No available method could read the registry"
+            )
+        return results
 
-    def _read_with_hivex(self, hive: str, key_path: str) -> RegistryReadResult:
-        """Read registry using hivex library"""
-        result = RegistryReadResult(method_used='hivex')
+    def _read_with_regipy(self, hive: str, key_paths: List[str]) -> Dict[str, RegistryReadResult]:
+        """Read registry keys using regipy, parsing the hive file directly"""
+        results = {kp: RegistryReadResult(method_used='regipy') for kp in key_paths}
 
         try:
-            import hivex
+            from regipy.exceptions import RegistryKeyNotFoundException
+            from regipy.registry import RegistryHive
+
+            reg = self._regipy_hives.get(hive)
+            if reg is None:
+                hive_path = self._get_hive_path(hive)
+                if not hive_path:
+                    for result in results.values():
+                        result.error = f"Hive file not found for {hive}"
+                    return results
+                reg = RegistryHive(str(hive_path))
+                self._regipy_hives[hive] = reg
+        except ImportError:
+            for result in results.values():
+                result.error = "regipy library not available"
+            return results
+        except Exception as e:
+            for result in results.values():
+                result.error = f"regipy error: {str(e)}"
+            logger.exception("Regipy read failed")
+            return results
 
-            hive_path = self._get_hive_path(hive)
-            if not hive_path:
-                result.error = f"Hive file not found for {hive}"
-                return result
+        for key_path, result in results.items():
+            try:
+                try:
+                    node = reg.get_key('\\' + key_path.strip('\\'))
+                except RegistryKeyNotFoundException:
+                    result.error = f"Key not found: {key_path}"
+                    continue
 
-            h = hivex.Hivex(str(hive_path))
+                reg_key = RegistryKey(path=key_path)
 
-            # Navigate to the key
-            key_parts = key_path.strip('\\').split('\\')
-            node = h.root()
+                # trim_values=False: regipy truncates long values by default
+                for value in node.iter_values(trim_values=False):
+                    name = "(Default)" if value.name == "(default)" else value.name
+                    data = value.value
+                    if isinstance(data, bytes):
+                        data = data.hex()  # Match _parse_value_data for REG_BINARY
+                    reg_key.values[name] = RegistryValue(
+                        name=name,
+                        value_type=value.value_type,
+                        data=data
+                    )
 
-            for part in key_parts:
-                if not part:
-                    continue
-                found = False
-                for child in h.node_children(node):
-                    if h.node_name(child).lower() == part.lower():
-                        node = child
-                        found = True
-                        break
-                if not found:
-                    result.error = f"Key not found: {key_path}"
-                    h.close()
-                    return result
+                reg_key.subkeys = [subkey.name for subkey in node.iter_subkeys()]
+
+                result.success = True
+                result.key = reg_key
+            except Exception as e:
+                result.error = f"regipy error: {str(e)}"
+                logger.exception("Regipy read failed")
 
-            # Read values
-            reg_key = RegistryKey(path=key_path)
+        return results
 
-            for value in h.node_values(node):
-                name = h.value_key(value) or "(Default)"
-                val_type = h.value_type(value)[0]
-                type_name = self.REG_TYPES.get(val_type, f'Unknown({val_type})')
+    def _read_with_hivex(self, hive: str, key_paths: List[str]) -> Dict[str, RegistryReadResult]:
+        """Read registry keys using hivex library, opening the hive once"""
+        results = {kp: RegistryReadResult(method_used='hivex') for kp in key_paths}
 
+        try:
+            import hivex
+
+            hive_path = self._get_hive_path(hive)
+            if not hive_path:
+                for result in results.values():
+                    result.error = f"Hive file not found for {hive}"
+                return results
+
+            h = hivex.Hivex(str(hive_path))
+        except ImportError:
+            for result in results.values():
+                result.error = "hivex library not available"
+            return results
+        except Exception as e:
+            for result in results.values():
+                result.error = f"hivex error: {str(e)}"
+            logger.exception("Hivex read failed")
+            return results
+
+        child_maps: Dict[int, Dict[str, int]] = {}
+        try:
+            for key_path, result in results.items():
                 try:
-                    data = h.value_value(value)[1]
-                    parsed_data = self._parse_value_data(val_type, data)
+                    self._read_hivex_key(h, key_path, result, child_maps)
                 except Exception as e:
-                    parsed_data = f"<error: {e}>"
+                    result.error = f"hivex error: {str(e)}"
+                    logger.exception("Hivex read failed")
+        finally:
+            h.close()
+
+        return results
+
+    def _read_hivex_key(self, h, key_path: str, result: RegistryReadResult,
+                        child_maps: Dict[int, Dict[str, int]]) -> None:
+        """Navigate an open hivex handle to key_path and fill in result"""
+        # Navigate to the key
+        key_parts = key_path.strip('\\').split('\\')
+        node = h.root()
+
+        for part in key_parts:
+            if not part:
+                continue
+            # One enumeration per node, then case-insensitive dict lookups;
+            # keys in the same batch share the maps for common parents
+            children = child_maps.get(node)
+            if children is None:
+                children = {h.node_name(child).lower(): child for child in h.node_children(node)}
+                child_maps[node] = children
+            node = children.get(part.lower())
+            if node is None:
+                result.error = f"Key not found: {key_path}"
+                return
+
+        # Read values
+        reg_key = RegistryKey(path=key_path)
+
+        for value in h.node_values(node):
+            name = h.value_key(value) or "(Default)"
+            val_type = h.value_type(value)[0]
+            type_name = self.REG_TYPES.get(val_type, f'Unknown({val_type})')
 
+            try:
                 reg_key.values[name] = RegistryValue(
                     name=name,
                     value_type=type_name,
-                    data=parsed_data
+                    raw_data=h.value_value(value)[1],
+                    reg_type=val_type
+                )
+            except Exception as e:
+                reg_key.values[name] = RegistryValue(
+                    name=name,
+                    value_type=type_name,
+                    data=f"<error: {e}>"
                 )
 
-            # Get subkeys
-            for child in h.node_children(node):
-                reg_key.subkeys.append(h.node_name(child))
-
-            h.close()
+        # Get subkeys
+        for child in h.node_children(node):
+            reg_key.subkeys.append(h.node_name(child))
 
-            result.success = True
-            result.key = reg_key
+        result.success = True
+        result.key = reg_key
 
-        except ImportError:
-            result.error = "hivex library not available"
-        except Exception as e:
-            result.error = f"hivex error: {str(e)}"
-            logger.exception("Hivex read failed")
-
-        return result
-
-    def _read_with_powershell(self, hive: str, key_path: str) -> RegistryReadResult:
+    def _windows_hive_path(self, hive: str) -> Tuple[Optional[str], Optional[str]]:
         """
-        Read registry using PowerShell.
+        Locate a hive file and express it as a Windows path for reg load.
 
-        This method uses reg.exe to load the hive temporarily, query it,
-        then unload. Requires elevation on Windows.
+        Returns:
+            (path, None) on success, (None, error) otherwise
         """
-        result = RegistryReadResult(method_used='powershell')
-
         hive_path = self._get_hive_path(hive)
         if not hive_path:
-            result.error = f"Hive file not found for {hive}"
-            return result
+            return None, f"Hive file not found for {hive}"
 
-        # Convert path for PowerShell
         if self.is_wsl:
             # Convert /mnt/d/path to D:\path
             drive_letter = self._extract_drive_letter()
-            if drive_letter:
-                hive_path_str = str(hive_path).replace(str(self.drive_path), f'{drive_letter}:')
-                hive_path_str = hive_path_str.replace('/', '\\')
-            else:
-                result.error = "Could not extract drive letter for WSL path"
-                return result
-        else:
-            hive_path_str = str(hive_path)
+            if not drive_letter:
+                return None, "Could not extract drive letter for WSL path"
+            hive_path_str = str(hive_path).replace(str(self.drive_path), f'{drive_letter}:')
+            return hive_path_str.replace('/', '\\'), None
+
+        return str(hive_path), None
+
+    def _read_with_regexe(self, hive: str, key_paths: List[str]) -> Dict[str, RegistryReadResult]:
+        """
+        Read registry keys using reg.exe directly.
+
+        Loads the hive once, runs `reg query` per key and unloads, without
+        starting PowerShell. Requires elevation on Windows.
+        """
+        results = {kp: RegistryReadResult(method_used='regexe') for kp in key_paths}
+
+        def fail_all(error: str) -> Dict[str, RegistryReadResult]:
+            for result in results.values():
+                result.error = error
+            return results
+
+        hive_path_str, error = self._windows_hive_path(hive)
+        if error:
+            return fail_all(error)
+
+        temp_key = f"HKLM\\TEMP_OFFLINE_{hive}_{os.getpid()}"
+
+        def reg(*args: str) -> subprocess.CompletedProcess:
+            return subprocess.run(
+                [self.regexe_path, *args],
+                capture_output=True,
+                text=True,
+                errors='replace',
+                timeout=30
+            )
+
+        try:
+            load = reg('load', temp_key, hive_path_str)
+            if load.returncode != 0:
+                return fail_all(f"Failed to load hive: {(load.stderr or load.stdout).strip()}")
+
+            try:
+                for key_path, result in results.items():
+                    query = reg('query', f"{temp_key}\\{key_path}")
+                    result.raw_output = query.stdout
+                    if query.returncode != 0:
+                        result.error = (query.stderr or query.stdout).strip() or f"Key not found: {key_path}"
+                        continue
+                    result.key = self._parse_reg_query(key_path, query.stdout)
+                    result.success = True
+            finally:
+                reg('unload', temp_key)
+
+        except subprocess.TimeoutExpired:
+            return fail_all("reg.exe command timed out")
+        except Exception as e:
+            return fail_all(f"reg.exe execution failed: {e}")
+
+        return results
+
+    @staticmethod
+    def _parse_reg_query(key_path: str, output: str) -> RegistryKey:
+        """Parse the values and subkeys listed by a non-recursive `reg query`"""
+        reg_key = RegistryKey(path=key_path)
+        header = None
+
+        for line in output.splitlines():
+            match = _REG_QUERY_VALUE_RE.match(line)
+            if match:
+                name, value_type, text = match.groups()
+                text = text or ''
+                if name == '(Default)' and text == '(value not set)':
+                    continue
+                if value_type == 'REG_BINARY':
+                    # Keep the bytes, decode lazily like hivex values
+                    reg_key.values[name] = RegistryValue(
+                        name=name,
+                        value_type=value_type,
+                        raw_data=bytes.fromhex(text),
+                        reg_type=3
+                    )
+                    continue
+                if value_type in ('REG_DWORD', 'REG_QWORD'):
+                    data: Any = int(text, 16)
+                elif value_type == 'REG_MULTI_SZ':
+                    data = [s for s in text.split('\\0') if s]
+                else:
+                    data = text
+                reg_key.values[name] = RegistryValue(name=name, value_type=value_type, data=data)
+            elif line.startswith('HKEY_'):
+                # First HKEY_ line is the key itself, the rest are its subkeys
+                if header is None:
+                    header = line
+                else:
+                    reg_key.subkeys.append(line.rsplit('\\', 1)[-1])
+
+        return reg_key
 
-        # PowerShell script to load hive, read key, unload
+    def _read_with_powershell(self, hive: str, key_paths: List[str]) -> Dict[str, RegistryReadResult]:
+        """
+        Read registry keys using PowerShell.
+
+        This method uses reg.exe to load the hive temporarily, query every
+        requested key, then unload. Requires elevation on Windows.
+        """
+        results = {kp: RegistryReadResult(method_used='powershell') for kp in key_paths}
+
+        def fail_all(error: str) -> Dict[str, RegistryReadResult]:
+            for result in results.values():
+                result.error = error
+            return results
+
+        hive_path_str, error = self._windows_hive_path(hive)
+        if error:
+            return fail_all(error)
+
+        # PowerShell script to load hive, read keys, unload
         # Uses a unique temp key name to avoid conflicts
         temp_key_name = f"TEMP_OFFLINE_{hive}_{os.getpid()}"
+        key_list = ', '.join("'{}'".format(kp.replace("'", "''")) for kp in key_paths)
 
         ps_script = f"""
 $ErrorActionPreference = 'Stop'
 
 $hivePath = '{hive_path_str}'
 $tempKeyName = '{temp_key_name}'
-$keyPath = '{key_path}'
+$keyPaths = @({key_list})
 
-$result = @{{
-    success = $false
-    values = @{{}}
-    subkeys = @()
+$output = @{{
+    keys = @{{}}
     error = $null
 }}
+$base = $null
 
 try {{
     # Load the hive
@@ -352,38 +751,58 @@ try {{
         throw "Failed to load hive: $loadResult"
     }}
 
-    # Query the key
-    $fullKeyPath = "HKLM\\$tempKeyName\\$keyPath"
+    # Read through .NET directly; Get-ItemProperty wraps every value in a
+    # PSObject and loses the registry value kind
+    $base = [Microsoft.Win32.RegistryKey]::OpenBaseKey('LocalMachine', 'Default')
 
-    # Get values
-    try {{
-        $regKey = Get-ItemProperty -Path "Registry::$fullKeyPath" -ErrorAction Stop
-        foreach ($prop in $regKey.PSObject.Properties) {{
-            if ($prop.Name -notmatch '^PS') {{
-                $result.values[$prop.Name] = @{{
-                    name = $prop.Name
-                    type = $prop.TypeNameOfValue
-                    data = $prop.Value
+    foreach ($keyPath in $keyPaths) {{
+        $result = @{{
+            success = $false
+            values = @{{}}
+            subkeys = @()
+            error = $null
+        }}
+
+        $regKey = $base.OpenSubKey("$tempKeyName\\$keyPath")
+        if ($null -eq $regKey) {{
+            $result.error = "Key not found: $keyPath"
+            $output.keys[$keyPath] = $result
+            continue
+        }}
+
+        try {{
+            # Get values (REG_EXPAND_SZ left unexpanded, as stored)
+            foreach ($name in $regKey.GetValueNames()) {{
+                $data = $regKey.GetValue($name, $null, [Microsoft.Win32.RegistryValueOptions]::DoNotExpandEnvironmentNames)
+                if ($data -is [byte[]]) {{
+                    # Binary as base64 rather than a JSON array of ints
+                    $data = @{{ b64 = [Convert]::ToBase64String($data) }}
+                }}
+                $result.values[$name] = @{{
+                    name = $name
+                    type = $regKey.GetValueKind($name).ToString()
+                    data = $data
                 }}
             }}
+
+            # Get subkeys
+            $result.subkeys = @($regKey.GetSubKeyNames())
+            $result.success = $true
+        }} finally {{
+            $regKey.Close()
         }}
-    }} catch {{
-        # Key might not have values, continue
-    }}
 
-    # Get subkeys
-    try {{
-        $subkeys = Get-ChildItem -Path "Registry::$fullKeyPath" -ErrorAction Stop
-        $result.subkeys = @($subkeys | ForEach-Object {{ $_.PSChildName }})
-    }} catch {{
-        # Key might not have subkeys
+        $output.keys[$keyPath] = $result
     }}
 
-    $result.success = $true
-
 }} catch {{
-    $result.error = $_.Exception.Message
+    $output.error = $_.Exception.Message
 }} finally {{
+    # Open handles keep reg unload from releasing the hive
+    if ($null -ne $base) {{
+        $base.Close()
+    }}
+
     # Always try to unload the hive
     try {{
         [gc]::Collect()
@@ -394,103 +813,86 @@ try {{
     }}
 }}
 
-$result | ConvertTo-Json -Depth 4
+$output | ConvertTo-Json -Depth 5 -Compress
 """
 
         try:
-            proc = subprocess.run(
-                [self.powershell_path, '-Command', ps_script],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            # Reuse one PowerShell process across reads (-NoProfile, started once)
+            if self._ps_host is None:
+                self._ps_host = PowerShellHost(self.powershell_path)
+            output, _ = self._ps_host.run_script(ps_script, timeout_seconds=30)
 
-            result.raw_output = proc.stdout
+            if not output.strip():
+                return fail_all("No output from PowerShell")
 
-            if proc.stdout.strip():
-                import json
-                data = json.loads(proc.stdout)
+            # The compressed JSON is the script's last line; anything before
+            # it (e.g. warning text) is not part of the payload
+            parsed = json.loads(output.strip().splitlines()[-1])
+            keys = parsed.get('keys') or {}
 
-                if data.get('success'):
-                    reg_key = RegistryKey(path=key_path)
+            for key_path, result in results.items():
+                result.raw_output = output
+                key_data = keys.get(key_path)
 
-                    for name, val_info in data.get('values', {}).items():
-                        reg_key.values[name] = RegistryValue(
-                            name=name,
-                            value_type=val_info.get('type', 'Unknown'),
-                            data=val_info.get('data')
-                        )
+                if key_data and key_data.get('success'):
+                    reg_key = RegistryKey(path=key_path)
 
-                    reg_key.subkeys = data.get('subkeys', [])
+                    for name, val_info in (key_data.get('values') or {}).items():
+                        # .NET reports the default value under an empty name
+                        name = name or "(Default)"
+                        kind = val_info.get('type', 'Unknown')
+                        value_type = _VALUE_KIND_TYPES.get(kind, kind)
+                        data = val_info.get('data')
+                        if isinstance(data, dict) and 'b64' in data:
+                            # REG_BINARY: keep the bytes, decode lazily like hivex values
+                            reg_key.values[name] = RegistryValue(
+                                name=name,
+                                value_type=value_type,
+                                raw_data=base64.b64decode(data['b64']),
+                                reg_type=3
+                            )
+                        else:
+                            if isinstance(data, int) and data < 0 and value_type in _UNSIGNED_RANGE:
+                                # .NET hands DWORD/QWORD back signed
+                                data += _UNSIGNED_RANGE[value_type]
+                            reg_key.values[name] = RegistryValue(
+                                name=name,
+                                value_type=value_type,
+                                data=data
+                            )
+
+                    reg_key.subkeys = key_data.get('subkeys') or []
 
                     result.success = True
                     result.key = reg_key
                 else:
-                    result.error = data.get('error', 'Unknown error')
-            else:
-                result.error = proc.stderr or "No output from PowerShell"
+                    result.error = (key_data or {}).get('error') or parsed.get('error') or 'Unknown error'
 
         except subprocess.TimeoutExpired:
-            result.error = "PowerShell command timed out"
+            return fail_all("PowerShell command timed out")
         except json.JSONDecodeError as e:
-            result.error = f"Failed to parse PowerShell output: {e}"
+            return fail_all(f"Failed to parse PowerShell output: {e}")
         except Exception as e:
-            result.error = f"PowerShell execution failed: {e}"
-
-        return result
-
-    def _parse_value_data(self, value_type: int, data: bytes) -> Any:
-        """Parse registry value data based on type"""
-        if value_type == 1:  # REG_SZ
-            try:
-                return data.decode('utf-16-le').rstrip('\x00')
-            except:
-                return data.decode('utf-8', errors='replace').rstrip('\x00')
+            return fail_all(f"PowerShell execution failed: {e}")
 
-        elif value_type == 2:  # REG_EXPAND_SZ
-            try:
-                return data.decode('utf-16-le').rstrip('\x00')
-            except:
-                return data.decode('utf-8', errors='replace').rstrip('\x00')
-
-        elif value_type == 3:  # REG_BINARY
-            return data.hex()
+        return results
 
-        elif value_type == 4:  # REG_DWORD
-            if len(data) >= 4:
-                return struct.unpack('<I', data[:4])[0]
-            return None
-
-        elif value_type == 5:  # REG_DWORD_BIG_ENDIAN
-            if len(data) >= 4:
-                return struct.unpack('>I', data[:4])[0]
-            return None
-
-        elif value_type == 7:  # REG_MULTI_SZ
-            try:
-                decoded = data.decode('utf-16-le')
-                return [s for s in decoded.split('\x00') if s]
-            except:
-                return [data.decode('utf-8', errors='replace')]
-
-        elif value_type == 11:  # REG_QWORD
-            if len(data) >= 8:
-                return struct.unpack('<Q', data[:8])[0]
-            return None
-
-        else:
-            return data.hex() if data else None
-
-    def read_windows_version(self) -> Dict[str, Any]:
+    def read_windows_version(self, include_computer_name: bool = False) -> Dict[str, Any]:
         """
         Read Windows version information from the SOFTWARE hive.
 
+        Args:
+            include_computer_name: Also read the computer name from the
+                SYSTEM hive
+
         Returns a dictionary with:
         - ProductName
         - DisplayVersion
         - CurrentBuild
         - EditionID
         - InstallDate
+        - ComputerName (only with include_computer_name; None if the
+          SYSTEM hive can't be read)
         - And other version-related values
         """
         result = {
@@ -514,6 +916,8 @@ $result | ConvertTo-Json -Depth 4
 
         # Read from SOFTWARE\Microsoft\Windows NT\CurrentVersion
         key_path = "Microsoft\\Windows NT\\CurrentVersion"
+        if include_computer_name:
+            result['computer_name'] = None
         read_result = self.read_key('SOFTWARE', key_path)
 
         if not read_result.success:
@@ -549,6 +953,17 @@ $result | ConvertTo-Json -Depth 4
                 result[result_key] = val.data
                 result['raw_values'][reg_name] = val.to_dict()
 
+        if include_computer_name:
+            # Offline hives have no CurrentControlSet link; ControlSet001 is
+            # the active set on nearly all installs
+            name_result = self.read_key(
+                'SYSTEM', "ControlSet001\\Control\\ComputerName\\ComputerName"
+            )
+            if name_result.success and 'ComputerName' in name_result.key.values:
+                val = name_result.key.values['ComputerName']
+                result['computer_name'] = val.data
+                result['raw_values']['ComputerName'] = val.to_dict()
+
         # Parse InstallDate if it's a Unix timestamp
         if result['install_date']:
             try:
@@ -575,7 +990,10 @@ def read_offline_registry(drive_path: str, hive: str, key_path: str) -> Dict[str
         Dictionary with key data or error
     """
     reader = RegistryReader(drive_path)
-    result = reader.read_key(hive, key_path)
+    try:
+        result = reader.read_key(hive, key_path)
+    finally:
+        reader.close()
     return result.to_dict()
 
 
@@ -590,7 +1008,10 @@ def get_windows_version(drive_path: str) -> Dict[str, Any]:
         Dictionary with Windows version info
     """
     reader = RegistryReader(drive_path)
-    return reader.read_windows_version()
+    try:
+        return reader.read_windows_version()
+    finally:
+        reader.close()
 
 
 if __name__ == '__main__':
@@ -617,4 +1038,5 @@ if __name__ == '__main__':
         # Get Windows version
         result = get_windows_version(drive_path)
 
-    print(json.dumps(result, indent=2, default=str))
+    json.dump(result, sys.stdout, indent=2, default=str)
+    sys.stdout.write('\n')